@@ -0,0 +1,65 @@
+# benchmarks/bcrypt_login.py
+# Reports login (bcrypt verify) throughput and latency for each cost factor.
+#
+#   python benchmarks/bcrypt_login.py --costs 10 11 12 13 --logins 200 --concurrency 16
+#
+# Logins go through passwords.verify_password, so the numbers include the
+# bounded executor exactly as the login route uses it. No database needed.
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+
+import passwords
+from config import Config
+
+
+def run(cost, logins, concurrency):
+    stored_hash = bcrypt.hashpw(b'correct horse battery staple', bcrypt.gensalt(rounds=cost))
+    latencies = []
+
+    def login(_):
+        started = time.perf_counter()
+        assert passwords.verify_password('correct horse battery staple', stored_hash)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'cost': cost,
+        'throughput': logins / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report login throughput for each bcrypt cost factor.")
+    parser.add_argument('--costs', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--logins', type=int, default=100, help='Logins per cost setting')
+    parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous login requests')
+    parser.add_argument('--workers', type=int, default=Config.BCRYPT_WORKERS, help='Size of the hashing pool')
+    args = parser.parse_args()
+
+    Config.BCRYPT_WORKERS = args.workers
+    Config.BCRYPT_MAX_QUEUED = max(Config.BCRYPT_MAX_QUEUED, args.concurrency)
+
+    print(f"{args.logins} logins per cost, {args.concurrency} concurrent clients, {args.workers} hashing workers")
+    print(f"{'cost':>4}  {'logins/s':>9}  {'p50 ms':>8}  {'p95 ms':>8}")
+    for cost in args.costs:
+        result = run(cost, args.logins, args.concurrency)
+        print(f"{result['cost']:>4}  {result['throughput']:>9.1f}  {result['p50_ms']:>8.1f}  {result['p95_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
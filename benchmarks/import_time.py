@@ -0,0 +1,122 @@
+# benchmarks/import_time.py
+# Measures cold-start time: how long a fresh interpreter takes to import the app.
+#
+#   python benchmarks/import_time.py --runs 10 --output startup.json
+#   python benchmarks/import_time.py --baseline startup.json --max-ms 1500
+#
+# Each run starts a new Python process (as a gunicorn worker boot does) and
+# imports --module with -X importtime. The report gives the median and worst
+# wall time, the slowest of its direct imports by cumulative time, and fails if
+# any module in LAZY_MODULES was loaded at import, since those should only
+# load on first use. With --baseline the median is compared against an
+# earlier --output file, and a slowdown beyond --tolerance percent fails.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use; importing the app must not pull these in
+LAZY_MODULES = ['fitz', 'google.generativeai', 'numpy']
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print("RESULT", elapsed, ",".join(name for name in {lazy!r} if name in sys.modules))
+"""
+
+
+def run_once(module):
+    """Import the module in a fresh interpreter. Returns (seconds, eager lazy modules, importtime lines)."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    result = [line for line in completed.stdout.splitlines() if line.startswith('RESULT')]
+    if completed.returncode != 0 or not result:
+        sys.exit(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    _, seconds, eager = (result[-1].split(' ') + [''])[:3]
+    return float(seconds), [name for name in eager.split(',') if name], completed.stderr.splitlines()
+
+
+def slowest_imports(importtime_lines, module, top):
+    """Return [(cumulative ms, name)] for the modules imported directly by `module`, slowest first."""
+    children = []
+    for line in importtime_lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        # A module's imports are listed (one level deeper) just before the module itself
+        if depth == 1:
+            children.append((int(cumulative) / 1000, name.strip()))
+        elif depth == 0:
+            if name.strip() == module:
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long a fresh process takes to import the app.")
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters to start')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list')
+    parser.add_argument('--max-ms', type=float, help='Fail if the median is slower than this')
+    parser.add_argument('--output', help='Write results to this JSON file (e.g. to use as a baseline)')
+    parser.add_argument('--baseline', help='Compare against results from an earlier --output')
+    parser.add_argument('--tolerance', type=float, default=10.0, help='Percent slowdown flagged as a regression')
+    args = parser.parse_args()
+
+    # The first run warms the filesystem and .pyc caches and isn't counted
+    run_once(args.module)
+    timings = []
+    eager = set()
+    importtime_lines = []
+    for _ in range(args.runs):
+        seconds, loaded, importtime_lines = run_once(args.module)
+        timings.append(seconds * 1000)
+        eager.update(loaded)
+
+    result = {
+        'module': args.module,
+        'runs': args.runs,
+        'median_ms': statistics.median(timings),
+        'max_ms': max(timings),
+        'eager_modules': sorted(eager),
+    }
+    print(f"import {args.module}: median {result['median_ms']:.0f} ms, max {result['max_ms']:.0f} ms over {args.runs} runs")
+    print(f"{'cumulative ms':>14}  module")
+    for cumulative_ms, name in slowest_imports(importtime_lines, args.module, args.top):
+        print(f"{cumulative_ms:>14.1f}  {name}")
+
+    failures = []
+    if eager:
+        failures.append(f"loaded at import instead of on first use: {', '.join(sorted(eager))}")
+    if args.max_ms is not None and result['median_ms'] > args.max_ms:
+        failures.append(f"median {result['median_ms']:.0f} ms is over the {args.max_ms:.0f} ms budget")
+    if args.baseline:
+        with open(args.baseline) as f:
+            previous = json.load(f)['median_ms']
+        change = (result['median_ms'] - previous) / previous * 100
+        print(f"vs baseline: {previous:.0f} ms -> {result['median_ms']:.0f} ms ({change:+.0f}%)")
+        if change > args.tolerance:
+            failures.append(f"median is {change:.0f}% slower than the baseline")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if failures:
+        print("Regressions: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
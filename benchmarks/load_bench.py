@@ -0,0 +1,293 @@
+# benchmarks/load_bench.py
+# Drives concurrent traffic through the app's routes and reports latency per route.
+#
+#   CAPSARC_DB_NAME=capsarc_bench python benchmarks/load_bench.py --requests 500 --concurrency 16 --output run.json
+#   CAPSARC_DB_NAME=capsarc_bench python benchmarks/load_bench.py --baseline run.json
+#
+# Run benchmarks/seed_data.py against the same database first. By default
+# requests go through Flask's test client in this process, and database
+# queries per request come from the per-request query tracking behind
+# /admin/metrics. With --url they are sent over HTTP to a running server
+# instead (which must use the same database). Queries are then estimated from
+# the server's Questions counter, which also counts background threads and
+# other clients, so that column is marked approximate (~).
+#
+# Each scenario runs on its own so its numbers aren't mixed with the others:
+# requests, errors, throughput, p50/p95/p99 latency and database queries per
+# request. With --baseline, every metric is compared against an earlier
+# --output file, and changes worse than --tolerance percent are flagged.
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+
+from config import Config
+from seed_data import BENCH_ADMIN, BENCH_PASSWORD, WORDS
+
+SCENARIOS = ['home', 'browse', 'project_details', 'view_pdf', 'login', 'admin_index']
+
+# Metrics where a higher number is better; for the rest lower is better
+HIGHER_IS_BETTER = {'throughput'}
+
+
+class TestClient:
+    """One simulated browser using Flask's test client (keeps its own cookies)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path, headers=None):
+        response = self.client.get(path, headers=headers)
+        response.close()
+        return response.status_code
+
+    def post(self, path, data):
+        response = self.client.post(path, data=data)
+        response.close()
+        return response.status_code
+
+
+class HttpClient:
+    """One simulated browser talking to a running server (keeps its own cookies)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            _NoRedirect,
+        )
+
+    def _send(self, request):
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def get(self, path, headers=None):
+        return self._send(urllib.request.Request(self.base_url + path, headers=headers or {}))
+
+    def post(self, path, data):
+        return self._send(urllib.request.Request(self.base_url + path, data=urllib.parse.urlencode(data).encode('utf-8')))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Report the 302 itself, as the test client does
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def _tracked_queries():
+    """Return a function giving (requests, queries) recorded by this process's request metrics."""
+    import metrics
+    return metrics.totals
+
+
+def _questions_counter():
+    """Return a function giving (None, server-wide statement count); the request count comes from the run."""
+    conn = mysql.connector.connect(host=Config.DB_HOST, user=Config.DB_USER, password=Config.DB_PASSWORD, database=Config.DB_NAME)
+    lock = threading.Lock()
+
+    def questions():
+        with lock:
+            cursor = conn.cursor()
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+            value = int(cursor.fetchone()[1]) - 1  # Minus the SHOW STATUS itself
+            cursor.close()
+        return None, value
+    return questions
+
+
+def _load_ids():
+    conn = mysql.connector.connect(host=Config.DB_HOST, user=Config.DB_USER, password=Config.DB_PASSWORD, database=Config.DB_NAME)
+    cursor = conn.cursor()
+    cursor.execute("SELECT project_id FROM project_details ORDER BY project_id")
+    project_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT username FROM users WHERE username LIKE 'bench\\_user\\_%' ORDER BY user_id LIMIT 1000")
+    usernames = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    if not project_ids or not usernames:
+        sys.exit("No benchmark data found; run benchmarks/seed_data.py first.")
+    return project_ids, usernames
+
+
+def _request_for(scenario, rng, project_ids, usernames):
+    """Return (method, path, data/headers) for one request of a scenario."""
+    if scenario == 'home':
+        return 'GET', f"/home?page={rng.randint(1, 20)}", None
+    if scenario == 'browse':
+        return 'GET', f"/browse?query={urllib.parse.quote(' '.join(rng.sample(WORDS, 2)))}&page={rng.randint(1, 3)}", None
+    if scenario == 'project_details':
+        return 'GET', f"/project/{rng.choice(project_ids)}", None
+    if scenario == 'view_pdf':
+        # What the viewer asks for first: the start of the file
+        return 'GET', f"/view_pdf/{rng.choice(project_ids)}", {'Range': 'bytes=0-65535'}
+    if scenario == 'login':
+        return 'POST', '/login', {'username': rng.choice(usernames), 'password': BENCH_PASSWORD}
+    if scenario == 'admin_index':
+        return 'GET', '/admin_dashboard', None
+    raise ValueError(scenario)
+
+
+def _make_client(args, app):
+    return HttpClient(args.url) if args.url else TestClient(app)
+
+
+def _login(client, scenario, usernames):
+    """Log each client in as the kind of user that normally visits the scenario."""
+    if scenario == 'admin_index':
+        path, username = '/login/admin', BENCH_ADMIN
+    elif scenario in ('home', 'browse', 'project_details') and usernames:
+        path, username = '/login', usernames[0]
+    else:
+        return
+    # A successful login redirects; anything else means the scenario would run logged out
+    status = client.post(path, {'username': username, 'password': BENCH_PASSWORD})
+    if status != 302:
+        sys.exit(f"Login as {username} at {path} returned {status}, expected 302.")
+
+
+def _percentile(sorted_values, fraction):
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(scenario, args, app, project_ids, usernames, query_totals):
+    rng = random.Random(f"{args.seed}-{scenario}")
+    plan = [_request_for(scenario, rng, project_ids, usernames) for _ in range(args.requests)]
+
+    clients = []
+    for _ in range(args.concurrency):
+        client = _make_client(args, app)
+        if not args.anonymous:
+            _login(client, scenario, usernames)
+        clients.append(client)
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(index):
+        client = clients[index]
+        for method, path, extra in plan[index::args.concurrency]:
+            started = time.perf_counter()
+            if method == 'GET':
+                status = client.get(path, headers=extra)
+            else:
+                status = client.post(path, extra)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if status >= 400:
+                    errors.append(status)
+
+    # Warm caches and pooled connections so the first requests don't skew the tail
+    for method, path, extra in plan[:min(args.concurrency, len(plan))]:
+        if method == 'GET':
+            clients[0].get(path, headers=extra)
+
+    requests_before, queries_before = query_totals()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    requests_after, queries_after = query_totals()
+    queries = queries_after - queries_before
+    counted = requests_after - requests_before if requests_before is not None else len(latencies)
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p95_ms': _percentile(latencies, 0.95) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'queries_per_request': queries / max(counted, 1),
+        'queries_approximate': bool(args.url),
+    }
+
+
+def print_results(results, baseline=None, tolerance=10.0):
+    columns = ['throughput', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request']
+    print(f"{'scenario':<16}{'reqs':>6}{'errs':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    regressions = []
+    for scenario, result in results.items():
+        approximate = '~' if result.get('queries_approximate') else ''
+        print(f"{scenario:<16}{result['requests']:>6}{result['errors']:>6}{result['throughput']:>10.1f}"
+              f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+              f"{approximate + format(result['queries_per_request'], '.1f'):>8}")
+        previous = (baseline or {}).get(scenario)
+        if not previous:
+            continue
+        changes = []
+        for column in columns:
+            if not previous.get(column):
+                continue
+            change = (result[column] - previous[column]) / previous[column] * 100
+            worse = -change if column in HIGHER_IS_BETTER else change
+            flag = ' !' if worse > tolerance else ''
+            if flag:
+                regressions.append(f"{scenario} {column}")
+            changes.append(f"{column} {change:+.0f}%{flag}")
+        print(f"{'':<16}vs baseline: " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the CAPSARC routes and report latency percentiles.")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous clients')
+    parser.add_argument('--url', help='Base URL of a running server (default: in-process test client)')
+    parser.add_argument('--anonymous', action='store_true', help="Don't log the clients in")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results to this JSON file (e.g. to use as a baseline)')
+    parser.add_argument('--baseline', help='Compare against results from an earlier --output')
+    parser.add_argument('--tolerance', type=float, default=10.0, help='Percent change flagged as a regression')
+    args = parser.parse_args()
+
+    app = None
+    if not args.url:
+        from app import app
+
+    project_ids, usernames = _load_ids()
+    query_totals = _questions_counter() if args.url else _tracked_queries()
+
+    print(f"{args.requests} requests per scenario, {args.concurrency} clients, "
+          f"{'HTTP ' + args.url if args.url else 'in-process'}, {len(project_ids)} projects")
+    results = {}
+    for scenario in args.scenarios:
+        results[scenario] = run_scenario(scenario, args, app, project_ids, usernames, query_totals)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    regressions = print_results(results, baseline, args.tolerance)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if regressions:
+        print("Regressions: " + ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+# benchmarks/seed_data.py
+# Fills a scratch database with a reproducible synthetic dataset for load_bench.py.
+#
+#   CAPSARC_DB_NAME=capsarc_bench python benchmarks/seed_data.py --users 50000 --projects 20000 --library 500000
+#
+# The database must already have the app schema and migrations applied. To
+# avoid wiping real data by accident, the database name has to end in
+# "_bench" unless --force is given. Existing rows in the seeded tables are
+# deleted first. The same --seed always produces the same rows.
+#
+# PDFs are generated with fitz: --pdf-variants distinct files whose sizes
+# follow a log-normal distribution around --pdf-size-mb (text pages plus
+# incompressible images standing in for figures). Projects share these files.
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+import fitz
+
+from config import Config
+from connect import database_connection
+import duplicates
+import page_cache
+import pdf_store
+import stats
+
+BATCH_SIZE = 5000
+BENCH_PASSWORD = 'benchmark-password'
+BENCH_ADMIN = 'bench_admin'
+
+WORDS = (
+    "system management information web mobile application online monitoring inventory attendance "
+    "student faculty library record tracking scheduling enrollment portal analytics detection "
+    "recognition learning machine based using design development evaluation automated smart "
+    "barangay municipal clinic health water energy sales ordering reservation payroll kiosk "
+    "geographic mapping sentiment classification chatbot assistance framework platform"
+).split()
+MAJORS = ['Information Technology', 'Computer Science', 'Information Systems', 'Multimedia', 'Networking']
+FIRST_NAMES = ['Ana', 'Ben', 'Carlo', 'Dina', 'Eli', 'Faye', 'Gino', 'Hana', 'Ivan', 'Joy', 'Kyle', 'Lea']
+LAST_NAMES = ['Reyes', 'Santos', 'Cruz', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Ramos', 'Villanueva']
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_pdf(rng, target_bytes):
+    """Build a PDF of roughly target_bytes: text pages, with an image every few pages."""
+    document = fitz.open()
+    pages = rng.randint(30, 120)
+    image_pages = max(1, pages // 6)
+    image_bytes = max(target_bytes - pages * 3000, 0) // image_pages
+    side = max(int((image_bytes / 3) ** 0.5), 16)
+    for number in range(pages):
+        page = document.new_page()
+        text = "\n".join(_sentence(rng, rng.randint(8, 16)) for _ in range(40))
+        page.insert_text((50, 60), text, fontsize=9)
+        if number % 6 == 0 and image_bytes:
+            samples = rng.randbytes(side * side * 3)
+            pixmap = fitz.Pixmap(fitz.csRGB, side, side, samples, False)
+            page.insert_image(fitz.Rect(50, 450, 300, 700), stream=pixmap.tobytes("png"))
+    data = document.tobytes(deflate=True)
+    document.close()
+    return data
+
+
+def _insert(cursor, sql, rows, label):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(sql, rows[start:start + BATCH_SIZE])
+    print(f"  {len(rows)} {label}")
+
+
+def seed(users, projects, library, pdf_variants, pdf_size_mb, seed_value):
+    rng = random.Random(seed_value)
+    started = time.monotonic()
+
+    print(f"Generating {pdf_variants} PDFs...")
+    pdf_hashes = []
+    for _ in range(pdf_variants):
+        size = int(rng.lognormvariate(0, 0.6) * pdf_size_mb * 1024 * 1024)
+        pdf_hashes.append(pdf_store.store_pdf(make_pdf(rng, size)))
+
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)).decode('utf-8')
+
+    user_rows = []
+    for i in range(users):
+        user_rows.append((
+            rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), 'BSIT', rng.choice(MAJORS), str(rng.randint(1, 4)),
+            f"bench_user_{i}", password_hash, f"bench_user_{i}@example.com",
+        ))
+
+    project_rows = []
+    for i in range(projects):
+        title = f"{_sentence(rng, rng.randint(4, 9))[:-1]} {i}"
+        authors = ", ".join(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(rng.randint(1, 4)))
+        year = rng.randint(2015, 2024)
+        project_rows.append((
+            title, authors, year, rng.choice(MAJORS), ", ".join(rng.sample(WORDS, 4)),
+            " ".join(_sentence(rng, rng.randint(10, 20)) for _ in range(8)),
+            rng.choice(pdf_hashes), duplicates.metadata_fingerprint(title, authors, year),
+            "<br>".join(_sentence(rng, 60) for _ in range(4)),
+        ))
+
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        print("Clearing seeded tables...")
+        for table in ('user_library', 'project_save_counts', 'project_minhash_bands', 'project_minhash', 'project_details', 'users'):
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute("DELETE FROM admins WHERE username = %s", (BENCH_ADMIN,))
+
+        print("Inserting...")
+        _insert(cursor, """
+            INSERT INTO users (first_name, last_name, course, major, year_level, username, password_hash, email)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, user_rows, "users")
+        _insert(cursor, """
+            INSERT INTO project_details (Title, Authors, Publication_Year, Major, Keywords, Abstract, pdf_hash,
+                                         metadata_fingerprint, generated_imrad, imrad_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'done')
+        """, project_rows, "projects")
+        cursor.execute("INSERT INTO admins (username, email, password) VALUES (%s, %s, %s)",
+                       (BENCH_ADMIN, 'bench_admin@example.com', password_hash))
+
+        cursor.execute("SELECT user_id FROM users")
+        user_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT project_id FROM project_details")
+        project_ids = [row[0] for row in cursor.fetchall()]
+
+        # Popularity is skewed: a few projects are saved far more than the rest
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(project_ids))]
+        target = min(library, len(user_ids) * len(project_ids))
+        seen = set()
+        library_rows = []
+        while len(library_rows) < target:
+            for project_id in rng.choices(project_ids, weights=weights, k=BATCH_SIZE):
+                pair = (rng.choice(user_ids), project_id)
+                if pair not in seen:
+                    seen.add(pair)
+                    library_rows.append(pair)
+                    if len(library_rows) == target:
+                        break
+        _insert(cursor, "INSERT INTO user_library (user_id, project_id) VALUES (%s, %s)", library_rows, "library entries")
+
+        page_cache.bump_generation(cursor)
+        conn.commit()
+
+    stats.reconcile()
+    print(f"Seeded in {time.monotonic() - started:.0f}s. Users and {BENCH_ADMIN} log in with '{BENCH_PASSWORD}'.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a scratch database with synthetic CAPSARC data.")
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--projects', type=int, default=20000)
+    parser.add_argument('--library', type=int, default=500000, help='user_library rows')
+    parser.add_argument('--pdf-variants', type=int, default=40, help='Distinct PDF files shared by the projects')
+    parser.add_argument('--pdf-size-mb', type=float, default=2.0, help='Median PDF size')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true', help="Seed even if the database name doesn't end in _bench")
+    args = parser.parse_args()
+
+    if not Config.DB_NAME.endswith('_bench') and not args.force:
+        sys.exit(f"Refusing to seed '{Config.DB_NAME}': set CAPSARC_DB_NAME to a *_bench database or pass --force.")
+
+    seed(args.users, args.projects, args.library, args.pdf_variants, args.pdf_size_mb, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+# catalog.py
+# Columnar in-memory catalog of project years and majors for faceted browsing.
+#
+# Each project is one row in parallel NumPy arrays: project_id, year (-1 when
+# missing), a dictionary-encoded major code, and a live flag. Year and major
+# filters become vectorized boolean masks, and facet counts come from
+# np.bincount over the masked rows, so filtering 100k projects takes a
+# fraction of a millisecond without touching MySQL. The matching IDs are then
+# loaded with one primary-key query.
+#
+# Rows are updated in place when projects are saved, edited or deleted, and
+# the whole catalog is rebuilt every SEARCH_INDEX_REFRESH seconds to pick up
+# changes made by other worker processes. NumPy is optional and is imported
+# by the first get_catalog() call; without it, or when the catalog cannot be
+# built, get_catalog() returns None and browse() falls back to SQL.
+import threading
+
+from config import Config
+from connect import database_connection
+from refreshed_index import RefreshedIndex
+
+np = None  # numpy, once _load_numpy() has imported it
+_numpy_missing = False
+
+MISSING_YEAR = -1
+INITIAL_CAPACITY = 1024
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Catalog:
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._lock = threading.Lock()
+        self._size = 0
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._years = np.full(capacity, MISSING_YEAR, dtype=np.int32)
+        self._majors = np.zeros(capacity, dtype=np.int32)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._rows = {}  # project_id -> row number
+        self._major_names = []  # code -> Major
+        self._major_codes = {}  # case-folded Major -> code
+        self._ordered = True  # Rows are in ascending project_id order
+
+    def _major_code(self, major):
+        major = (major or '').strip()
+        # Majors differing only in case share a code, named by the first spelling seen
+        key = major.casefold()
+        code = self._major_codes.get(key)
+        if code is None:
+            code = self._major_codes[key] = len(self._major_names)
+            self._major_names.append(major)
+        return code
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        for name in ('_ids', '_years', '_majors', '_live'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            if name == '_years':
+                grown.fill(MISSING_YEAR)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def add(self, project):
+        """Insert or update one project (a dict with project_id, Publication_Year and Major)."""
+        project_id = int(project['project_id'])
+        year = _to_int(project.get('Publication_Year'))
+        with self._lock:
+            row = self._rows.get(project_id)
+            if row is None:
+                if self._size == len(self._ids):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                if row and project_id < self._ids[row - 1]:
+                    self._ordered = False
+                self._rows[project_id] = row
+                self._ids[row] = project_id
+            self._years[row] = MISSING_YEAR if year is None else year
+            self._majors[row] = self._major_code(project.get('Major'))
+            self._live[row] = True
+
+    def remove(self, project_id):
+        with self._lock:
+            row = self._rows.get(int(project_id))
+            if row is not None:
+                self._live[row] = False
+
+    def _sort(self):
+        order = np.argsort(self._ids[:self._size], kind='stable')
+        for name in ('_ids', '_years', '_majors', '_live'):
+            array = getattr(self, name)
+            array[:self._size] = array[:self._size][order]
+        self._rows = {int(project_id): row for row, project_id in enumerate(self._ids[:self._size])}
+        self._ordered = True
+
+    def browse(self, year_from=None, year_to=None, major=None, limit=10, offset=0, after=None):
+        """Return (project_ids, total_matches, facets) for one page, newest project first.
+
+        facets is {'majors': [(Major, count), ...], 'years': [(year, count), ...]}.
+        Each facet is counted with every filter applied except its own, so the
+        counts show what picking another value would return.
+        """
+        year_from, year_to = _to_int(year_from), _to_int(year_to)
+        with self._lock:
+            if not self._ordered:
+                self._sort()
+            size = self._size
+            ids = self._ids[:size]
+            years = self._years[:size]
+            majors = self._majors[:size]
+
+            year_mask = self._live[:size].copy()
+            if year_from is not None:
+                year_mask &= years >= year_from
+            if year_to is not None:
+                year_mask &= years <= year_to
+
+            major_mask = self._live[:size].copy()
+            if major:
+                code = self._major_codes.get(major.strip().casefold())
+                if code is None:
+                    major_mask[:] = False
+                else:
+                    major_mask &= majors == code
+
+            mask = year_mask & major_mask
+            total = int(np.count_nonzero(mask))
+
+            if after is not None:
+                mask &= ids < int(after)
+                offset = 0
+            # Rows are in ascending ID order; the page is taken from the end
+            matches = np.flatnonzero(mask)
+            stop = len(matches) - offset
+            page_rows = matches[max(stop - limit, 0):max(stop, 0)][::-1]
+            project_ids = ids[page_rows].tolist()
+
+            major_counts = np.bincount(majors[year_mask], minlength=len(self._major_names))
+            known_years = years[major_mask]
+            known_years = known_years[known_years != MISSING_YEAR]
+            # bincount over offsets from the earliest year avoids sorting
+            first_year = int(known_years.min()) if known_years.size else 0
+            year_counts = np.bincount(known_years - first_year)
+            year_offsets = np.flatnonzero(year_counts)
+            facets = {
+                'majors': sorted(
+                    ((self._major_names[code], int(count)) for code, count in enumerate(major_counts) if count and self._major_names[code]),
+                    key=lambda item: (-item[1], item[0])
+                ),
+                'years': [(first_year + int(offset), int(year_counts[offset])) for offset in year_offsets[::-1]],
+            }
+        return project_ids, total, facets
+
+
+def _load_numpy():
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # Faceted browsing is disabled without NumPy
+            _numpy_missing = True
+    return np is not None
+
+
+# Function to load every project's year and major into a fresh Catalog
+def build_catalog():
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT project_id, Publication_Year, Major FROM project_details ORDER BY project_id")
+        projects = cursor.fetchall()
+    catalog = Catalog(capacity=max(INITIAL_CAPACITY, len(projects) * 2))
+    for project in projects:
+        catalog.add(project)
+    return catalog
+
+
+_catalog = RefreshedIndex(build_catalog, lambda: Config.SEARCH_INDEX_REFRESH, name='catalog')
+
+
+# Function to get the shared catalog, or None when NumPy isn't installed or the first build failed.
+# Rebuilt in the background every SEARCH_INDEX_REFRESH seconds to pick up other workers' changes.
+def get_catalog():
+    if not _load_numpy():
+        return None
+    try:
+        return _catalog.get()
+    except Exception as e:
+        print(f"Error building catalog: {e}")
+        return None
+
+
+# Function to add or refresh one project in the catalog after it is saved or edited
+def index_project(project):
+    _catalog.apply(lambda catalog: catalog.add(project))
+
+
+# Function to drop a project from the catalog after it is deleted
+def unindex_project(project_id):
+    _catalog.apply(lambda catalog: catalog.remove(project_id))
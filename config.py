@@ -1,15 +1,103 @@
-# config.py
-import os
-
-class Config:
-    UPLOAD_FOLDER = os.path.join('static', 'images')  # Upload folder for image files
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
-
-    
-    @staticmethod
-    # image files
-    def allowed_file(filename):
-        return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
-    
- 
+# config.py
+import os
+from datetime import timedelta
+
+class Config:
+    UPLOAD_FOLDER = os.path.join('static', 'images')  # Upload folder for image files
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+    # Server-side sessions (see session_store.py)
+    PERMANENT_SESSION_LIFETIME = timedelta(hours=int(os.environ.get('CAPSARC_SESSION_TTL_HOURS', 24 * 7)))  # Idle sessions expire after this
+    SESSION_SQLITE_PATH = os.environ.get('CAPSARC_SESSION_DB', os.path.join('storage', 'sessions.sqlite3'))
+    SESSION_LRU_SIZE = int(os.environ.get('CAPSARC_SESSION_LRU_SIZE', 4096))  # Sessions kept unpickled per process
+    SESSION_SWEEP_INTERVAL = int(os.environ.get('CAPSARC_SESSION_SWEEP_INTERVAL', 300))  # Seconds between expiry sweeps
+    SESSION_REFRESH_AFTER = int(os.environ.get('CAPSARC_SESSION_REFRESH_AFTER', 300))  # Rewrite unchanged sessions this often to extend expiry
+    SESSION_LEGACY_DIR = 'flask_session'  # Old Flask-Session files, imported on first use
+
+    # Database connection settings
+    DB_HOST = os.environ.get('CAPSARC_DB_HOST', 'localhost')
+    DB_USER = os.environ.get('CAPSARC_DB_USER', 'root')
+    DB_PASSWORD = os.environ.get('CAPSARC_DB_PASSWORD', '')
+    DB_NAME = os.environ.get('CAPSARC_DB_NAME', 'repository')
+
+    # Connection pool settings
+    DB_POOL_SIZE = int(os.environ.get('CAPSARC_DB_POOL_SIZE', 10))  # Max open connections per process
+    DB_POOL_TIMEOUT = float(os.environ.get('CAPSARC_DB_POOL_TIMEOUT', 10))  # Seconds to wait for a free connection
+    DB_CONNECT_TIMEOUT = int(os.environ.get('CAPSARC_DB_CONNECT_TIMEOUT', 5))  # Seconds to wait for the MySQL handshake
+    DB_POOL_RECYCLE = float(os.environ.get('CAPSARC_DB_POOL_RECYCLE', 300))  # Ping connections idle longer than this
+    DB_LEAK_TIMEOUT = float(os.environ.get('CAPSARC_DB_LEAK_TIMEOUT', 30))  # Log checkouts held longer than this
+
+    # Password hashing (see passwords.py)
+    BCRYPT_ROUNDS = int(os.environ.get('CAPSARC_BCRYPT_ROUNDS', 12))  # Cost factor for new hashes; older hashes are upgraded on login
+    BCRYPT_WORKERS = int(os.environ.get('CAPSARC_BCRYPT_WORKERS', os.cpu_count() or 2))
+    BCRYPT_MAX_QUEUED = int(os.environ.get('CAPSARC_BCRYPT_MAX_QUEUED', 32))  # Hashes allowed to wait for a worker
+    BCRYPT_QUEUE_TIMEOUT = float(os.environ.get('CAPSARC_BCRYPT_QUEUE_TIMEOUT', 5))  # Seconds to wait for a slot
+
+    # Seconds a session keeps its cached user ID and saved project IDs
+    USER_CONTEXT_TTL = int(os.environ.get('CAPSARC_USER_CONTEXT_TTL', 300))
+
+    # Content-addressed PDF storage (see pdf_store.py)
+    PDF_STORE_FOLDER = os.environ.get('CAPSARC_PDF_STORE', os.path.join('storage', 'pdfs'))
+
+    # Rendered PDF pages for the viewer (see page_images.py)
+    PAGE_IMAGE_FOLDER = os.environ.get('CAPSARC_PAGE_IMAGE_FOLDER', os.path.join('storage', 'page_images'))
+    PAGE_IMAGE_CACHE_MB = int(os.environ.get('CAPSARC_PAGE_IMAGE_CACHE_MB', 2048))  # Least recently used pages are deleted past this
+    PAGE_IMAGE_MAX_SCALE = float(os.environ.get('CAPSARC_PAGE_IMAGE_MAX_SCALE', 3.0))
+
+    # Background IMRaD generation (see jobs.py)
+    IMRAD_MODEL_CLIENT = os.environ.get('CAPSARC_IMRAD_MODEL_CLIENT', 'gemini')  # 'gemini' or 'stub'
+    IMRAD_WORKERS = int(os.environ.get('CAPSARC_IMRAD_WORKERS', 2))
+    IMRAD_MAX_ATTEMPTS = int(os.environ.get('CAPSARC_IMRAD_MAX_ATTEMPTS', 3))
+    IMRAD_RETRY_BACKOFF = float(os.environ.get('CAPSARC_IMRAD_RETRY_BACKOFF', 30))  # Seconds before the first retry, doubled each time
+    IMRAD_STALE_AFTER = int(os.environ.get('CAPSARC_IMRAD_STALE_AFTER', 900))  # Requeue 'processing' jobs older than this
+    IMRAD_CHUNK_CHARS = int(os.environ.get('CAPSARC_IMRAD_CHUNK_CHARS', 60000))  # Longer text is summarized in chunks first
+    IMRAD_MAP_CONCURRENCY = int(os.environ.get('CAPSARC_IMRAD_MAP_CONCURRENCY', 4))  # Chunk summaries in flight at once, across all jobs
+
+    # PDF text extraction (see extraction.py)
+    EXTRACT_WORKERS = int(os.environ.get('CAPSARC_EXTRACT_WORKERS', os.cpu_count() or 2))
+    EXTRACT_PARALLEL_MIN_PAGES = int(os.environ.get('CAPSARC_EXTRACT_PARALLEL_MIN_PAGES', 40))  # Smaller PDFs are read by one pool task
+    EXTRACT_PAGES_PER_TASK = int(os.environ.get('CAPSARC_EXTRACT_PAGES_PER_TASK', 16))
+    EXTRACT_TIMEOUT = float(os.environ.get('CAPSARC_EXTRACT_TIMEOUT', 120))  # Seconds allowed per document
+    EXTRACT_MAX_MEMORY_MB = int(os.environ.get('CAPSARC_EXTRACT_MAX_MEMORY_MB', 1024))  # Address-space limit for pool workers
+    EXTRACT_MAX_CHARS = int(os.environ.get('CAPSARC_EXTRACT_MAX_CHARS', 5_000_000))  # Text allowed per document
+
+    # Near-duplicate warnings (see duplicates.py)
+    DUPLICATE_MINHASH = os.environ.get('CAPSARC_DUPLICATE_MINHASH', '1') == '1'  # Compute MinHash signatures for extracted text
+    DUPLICATE_SIMILARITY = float(os.environ.get('CAPSARC_DUPLICATE_SIMILARITY', 0.8))  # Estimated overlap that counts as a possible duplicate
+
+    # Admin dashboard counters (see stats.py)
+    STATS_RECONCILE_INTERVAL = float(os.environ.get('CAPSARC_STATS_RECONCILE_INTERVAL', 3600))  # Seconds between background recounts; 0 leaves them to `python stats.py` in cron
+    DASHBOARD_TOP_N = int(os.environ.get('CAPSARC_DASHBOARD_TOP_N', 20))  # Rows in the "most saved" list
+
+    # Batch deletes from the admin pages
+    ADMIN_DELETE_CHUNK_SIZE = int(os.environ.get('CAPSARC_ADMIN_DELETE_CHUNK_SIZE', 500))  # IDs per DELETE ... IN statement
+    ADMIN_DELETE_MAX_IDS = int(os.environ.get('CAPSARC_ADMIN_DELETE_MAX_IDS', 20000))  # IDs accepted in one request
+
+    # Presence tracking (see presence.py)
+    PRESENCE_WINDOW = float(os.environ.get('CAPSARC_PRESENCE_WINDOW', 900))  # Seconds since the last request for a user to count as active
+    PRESENCE_FLUSH_INTERVAL = float(os.environ.get('CAPSARC_PRESENCE_FLUSH_INTERVAL', 30))  # Seconds between last_active/status writes
+
+    # Rendered-page cache for anonymous visitors (see page_cache.py)
+    PAGE_CACHE_SIZE = int(os.environ.get('CAPSARC_PAGE_CACHE_SIZE', 512))  # Rendered pages kept per process
+    CATALOG_GENERATION_TTL = float(os.environ.get('CAPSARC_CATALOG_GENERATION_TTL', 5))  # Seconds before re-checking for catalog changes
+
+    # Query diagnostics (see connect.py)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('CAPSARC_SLOW_QUERY_THRESHOLD_MS', 200))  # Log statements slower than this
+    SLOW_QUERY_EXPLAIN = os.environ.get('CAPSARC_SLOW_QUERY_EXPLAIN', '1') == '1'  # Include the EXPLAIN plan for slow SELECTs
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('CAPSARC_N_PLUS_ONE_THRESHOLD', 5))  # Same statement this often in one request is flagged
+    MAX_CONNECTIONS_PER_REQUEST = int(os.environ.get('CAPSARC_MAX_CONNECTIONS_PER_REQUEST', 3))  # More pooled checkouts than this are flagged
+
+    # Bearer token required by /admin/metrics; leave unset to allow unauthenticated scrapes
+    METRICS_TOKEN = os.environ.get('CAPSARC_METRICS_TOKEN')
+
+    # Full-text search index
+    SEARCH_INDEX_REFRESH = float(os.environ.get('CAPSARC_SEARCH_INDEX_REFRESH', 600))  # Seconds between full rebuilds
+
+    
+    @staticmethod
+    # image files
+    def allowed_file(filename):
+        return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    
+ 
@@ -1,15 +1,392 @@
-import mysql.connector
-
-# Helper function to get a database connection
-def get_database_connection():
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="repository"
-        )
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error: {err}")
-        return None
\ No newline at end of file
+import contextvars
+import logging
+import queue
+import re
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import errors
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+
+
+# Function to reduce a statement to its shape, so the same query with different values matches
+# ("SELECT * FROM t WHERE id IN (%s, %s) LIMIT 10" -> "SELECT * FROM t WHERE id IN (...) LIMIT ?")
+def fingerprint(statement):
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+    statement = _LITERAL_RE.sub('?', statement)
+    statement = _IN_LIST_RE.sub('IN (...)', statement)
+    return _WHITESPACE_RE.sub(' ', statement).strip()
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised by query_budget() when a block runs more queries or connections than allowed."""
+
+
+class QueryTracker:
+    """Counts, times and fingerprints the queries run while it is active (e.g. during one request)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.connections = 0
+        self.slow_queries = 0
+        self.fingerprints = Counter()
+
+    def record(self, statement, params, duration):
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+        if duration * 1000 >= Config.SLOW_QUERY_THRESHOLD_MS:
+            self.slow_queries += 1
+            _log_slow_query(statement, params, duration)
+
+    # Function to list what looks wrong with this set of queries: repeated
+    # statements (the N+1 pattern) and too many connections
+    def problems(self):
+        found = []
+        for shape, times in self.fingerprints.most_common():
+            if times < Config.N_PLUS_ONE_THRESHOLD:
+                break
+            found.append(f"ran {times} times: {shape}")
+        if self.connections > Config.MAX_CONNECTIONS_PER_REQUEST:
+            found.append(f"opened {self.connections} database connections")
+        return found
+
+
+_tracker = contextvars.ContextVar('query_tracker', default=None)
+_slow_queries = queue.Queue(maxsize=100)
+_slow_query_thread = None
+_slow_query_lock = threading.Lock()
+
+
+def _log_slow_query(statement, params, duration):
+    """Queue a slow statement to be logged with its EXPLAIN plan off the request thread."""
+    global _slow_query_thread
+    if _slow_query_thread is None:
+        with _slow_query_lock:
+            if _slow_query_thread is None:
+                _slow_query_thread = threading.Thread(target=_explain_slow_queries, name='slow-query-log', daemon=True)
+                _slow_query_thread.start()
+    try:
+        _slow_queries.put_nowait((statement, params, duration))
+    except queue.Full:
+        pass  # Under heavy load, drop rather than slow requests down
+
+
+def _explain_slow_queries():
+    while True:
+        statement, params, duration = _slow_queries.get()
+        plan = ""
+        text = statement.decode('utf-8', 'replace') if isinstance(statement, bytes) else statement
+        if Config.SLOW_QUERY_EXPLAIN and text.lstrip().upper().startswith('SELECT'):
+            try:
+                with database_connection() as conn:
+                    cursor = conn.cursor(dictionary=True)
+                    cursor.execute("EXPLAIN " + text, params)
+                    plan = "\n".join(str(row) for row in cursor.fetchall())
+            except Exception as e:
+                plan = f"(EXPLAIN failed: {e})"
+        logger.warning("Slow query (%.0f ms): %s\nparams=%r\n%s", duration * 1000, _WHITESPACE_RE.sub(' ', text).strip(), params, plan)
+
+
+# Function to start tracking queries in the current context; returns a token for stop_query_tracking()
+def start_query_tracking(tracker=None):
+    return _tracker.set(tracker or QueryTracker())
+
+
+# Function to stop tracking and return the tracker with the totals
+def stop_query_tracking(token):
+    tracker = _tracker.get()
+    _tracker.reset(token)
+    return tracker
+
+
+# Context manager that fails when the block runs more than max_queries queries
+# (or opens more than max_connections connections), for tests:
+#
+#     with query_budget(3):
+#         client.get('/project/1')
+@contextmanager
+def query_budget(max_queries, max_connections=None):
+    token = start_query_tracking()
+    try:
+        yield _tracker.get()
+    finally:
+        tracker = stop_query_tracking(token)
+    if tracker.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{tracker.count} queries run, budget is {max_queries}:\n"
+            + "\n".join(f"  {times} x {shape}" for shape, times in tracker.fingerprints.most_common())
+        )
+    if max_connections is not None and tracker.connections > max_connections:
+        raise QueryBudgetExceeded(f"{tracker.connections} connections opened, budget is {max_connections}")
+
+
+class InstrumentedCursor:
+    """Cursor wrapper that reports each execute() to the active QueryTracker."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, method, statement, *args, **kwargs):
+        tracker = _tracker.get()
+        if tracker is None:
+            return method(statement, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(statement, *args, **kwargs)
+        finally:
+            params = args[0] if args else kwargs.get('params')
+            tracker.record(statement, params if method == self._cursor.execute else None, time.perf_counter() - started)
+
+    def execute(self, statement, *args, **kwargs):
+        return self._timed(self._cursor.execute, statement, *args, **kwargs)
+
+    def executemany(self, statement, *args, **kwargs):
+        return self._timed(self._cursor.executemany, statement, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PooledConnection:
+    """Proxy around a MySQL connection checked out of a ConnectionPool.
+
+    Calling close() hands the connection back to the pool instead of
+    tearing down the socket. Any cursors opened through the proxy are
+    closed on release.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._cursors = []
+        self._released = False
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._raw.cursor(*args, **kwargs)
+        self._cursors.append(cursor)
+        return InstrumentedCursor(cursor)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections.
+
+    Connections are opened lazily up to `size`. When every connection is
+    checked out, acquire() waits up to `timeout` seconds and then raises
+    mysql.connector.errors.PoolError. Checkouts held longer than
+    `leak_timeout` are logged with the stack that took them, and proxies
+    that are garbage collected without being closed are reclaimed.
+    """
+
+    def __init__(self, size, timeout, leak_timeout, recycle, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self.leak_timeout = leak_timeout
+        self.recycle = recycle
+        self._connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._checked_out = {}  # id(proxy) -> [checkout time, stack, reported]
+        self._finalizers = {}
+
+    def _open(self):
+        return mysql.connector.connect(consume_results=True, **self._connect_args)
+
+    def acquire(self):
+        self.check_leaks()
+        raw = None
+        try:
+            raw, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    raw, idle_since = self._open(), time.monotonic()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    raw, idle_since = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise errors.PoolError(
+                        f"No database connection available after {self.timeout}s "
+                        f"({self.size} in use)"
+                    )
+
+        # Connections that sat idle for a while may have been dropped by the server
+        if time.monotonic() - idle_since > self.recycle:
+            try:
+                raw.ping(reconnect=True, attempts=1)
+            except errors.Error:
+                self._discard(raw)
+                return self.acquire()
+
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.connections += 1
+
+        proxy = PooledConnection(self, raw)
+        key = id(proxy)
+        with self._lock:
+            self._checked_out[key] = [time.monotonic(), traceback.format_stack(limit=8)[:-2], False]
+            self._finalizers[key] = weakref.finalize(proxy, self._reclaim, key, raw)
+        return proxy
+
+    def release(self, proxy):
+        key = id(proxy)
+        with self._lock:
+            self._checked_out.pop(key, None)
+            finalizer = self._finalizers.pop(key, None)
+        if finalizer is not None:
+            finalizer.detach()
+        for cursor in proxy._cursors:
+            try:
+                cursor.close()
+            except errors.Error:
+                pass
+        proxy._cursors = []
+        self._return(proxy._raw)
+
+    def _return(self, raw):
+        try:
+            # Drop any transaction the caller left open so the next user starts clean
+            raw.rollback()
+        except errors.Error:
+            self._discard(raw)
+            return
+        self._idle.put((raw, time.monotonic()))
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except errors.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def _reclaim(self, key, raw):
+        with self._lock:
+            entry = self._checked_out.pop(key, None)
+            self._finalizers.pop(key, None)
+        if entry is not None:
+            logger.warning(
+                "Database connection was garbage collected without being closed. Checked out at:\n%s",
+                "".join(entry[1]),
+            )
+        self._return(raw)
+
+    def check_leaks(self):
+        now = time.monotonic()
+        with self._lock:
+            stale = [entry for entry in self._checked_out.values()
+                     if not entry[2] and now - entry[0] > self.leak_timeout]
+            for entry in stale:
+                entry[2] = True
+        for entry in stale:
+            logger.warning(
+                "Database connection held for %.1fs without being returned. Checked out at:\n%s",
+                now - entry[0], "".join(entry[1]),
+            )
+        return len(stale)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'opened': self._opened,
+                'in_use': len(self._checked_out),
+                'idle': self._idle.qsize(),
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    size=Config.DB_POOL_SIZE,
+                    timeout=Config.DB_POOL_TIMEOUT,
+                    leak_timeout=Config.DB_LEAK_TIMEOUT,
+                    recycle=Config.DB_POOL_RECYCLE,
+                    host=Config.DB_HOST,
+                    user=Config.DB_USER,
+                    password=Config.DB_PASSWORD,
+                    database=Config.DB_NAME,
+                    connection_timeout=Config.DB_CONNECT_TIMEOUT,
+                )
+    return _pool
+
+
+# Context manager for a pooled database connection:
+#
+#     with database_connection() as conn:
+#         cursor = conn.cursor()
+#         ...
+#
+# The connection (and every cursor opened on it) goes back to the pool on exit.
+# Uncommitted work is rolled back.
+@contextmanager
+def database_connection():
+    with get_pool().connection() as conn:
+        yield conn
+
+
+# Helper function to get a database connection
+# Kept for callers that manage the connection by hand; close() returns it to the pool.
+def get_database_connection():
+    try:
+        return get_pool().acquire()
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        return None
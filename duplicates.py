@@ -0,0 +1,182 @@
+# duplicates.py
+# Duplicate detection for uploaded projects.
+#
+# Exact duplicates are found through two indexed columns on project_details:
+# pdf_hash (the sha256 of the file) and metadata_fingerprint (a sha256 of the
+# normalized title, authors and year), so a check is a couple of index
+# lookups instead of comparing the full abstract against every row.
+#
+# Near duplicates are optional (DUPLICATE_MINHASH). Each project's extracted
+# text gets a MinHash signature, split into LSH bands that are stored in
+# project_minhash_bands. Projects sharing a band bucket are candidates; their
+# signatures are compared to estimate text similarity, and those at or above
+# DUPLICATE_SIMILARITY are reported to admins as possible duplicates.
+import hashlib
+import re
+import struct
+
+from config import Config
+from connect import database_connection
+import typeahead
+
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 4 rows per band
+SHINGLE_WORDS = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _permutations():
+    """Fixed (a, b) pairs for the universal hashes, derived from a seed so every process agrees."""
+    pairs = []
+    for i in range(NUM_PERMUTATIONS):
+        digest = hashlib.sha256(f"capsarc-minhash-{i}".encode('ascii')).digest()
+        a, b = struct.unpack('<QQ', digest[:16])
+        pairs.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return pairs
+
+
+_PERMUTATIONS = _permutations()
+
+
+# Function to fingerprint a project's normalized title, authors and year
+def metadata_fingerprint(title, authors, year):
+    author_names = sorted(filter(None, (typeahead.normalize(name) for name in re.split(r"[,;&]| and ", authors or ''))))
+    key = "|".join([typeahead.normalize(title), ",".join(author_names), str(year or '').strip()])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+# Function to find projects with the same PDF or the same fingerprint.
+# Returns [{'project_id', 'Title', 'reason'}], ignoring exclude_id (the project being edited).
+def find_exact_duplicates(pdf_hash=None, fingerprint=None, exclude_id=None):
+    duplicates = []
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        for column, value, reason in (('pdf_hash', pdf_hash, 'same PDF'), ('metadata_fingerprint', fingerprint, 'same title, authors and year')):
+            if not value:
+                continue
+            cursor.execute(
+                f"SELECT project_id, Title FROM project_details WHERE {column} = %s AND project_id <> %s LIMIT 5",
+                (value, exclude_id or 0)
+            )
+            for row in cursor.fetchall():
+                row['reason'] = reason
+                duplicates.append(row)
+    return duplicates
+
+
+# Function to compute a MinHash signature (list of NUM_PERMUTATIONS ints) for some text
+def minhash_signature(text):
+    words = _WORD_RE.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles]
+    return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _bands(signature):
+    rows = NUM_PERMUTATIONS // BANDS
+    for band in range(BANDS):
+        chunk = struct.pack(f'<{rows}I', *signature[band * rows:(band + 1) * rows])
+        yield band, hashlib.blake2b(chunk, digest_size=8).hexdigest()
+
+
+def _similarity(left, right):
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERMUTATIONS
+
+
+# Function to store a project's MinHash signature and LSH bands (called once its text is extracted)
+def record_signature(project_id, text):
+    if not Config.DUPLICATE_MINHASH or not text:
+        return
+    signature = minhash_signature(text)
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM project_minhash_bands WHERE project_id = %s", (project_id,))
+        cursor.execute(
+            "REPLACE INTO project_minhash (project_id, signature) VALUES (%s, %s)",
+            (project_id, struct.pack(f'<{NUM_PERMUTATIONS}I', *signature))
+        )
+        cursor.executemany(
+            "INSERT INTO project_minhash_bands (band, bucket, project_id) VALUES (%s, %s, %s)",
+            [(band, bucket, project_id) for band, bucket in _bands(signature)]
+        )
+        conn.commit()
+
+
+# Function to drop deleted projects' signatures, using the caller's cursor (and transaction)
+def forget_projects(cursor, project_ids):
+    if not project_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    cursor.execute(f"DELETE FROM project_minhash_bands WHERE project_id IN ({placeholders})", list(project_ids))
+    cursor.execute(f"DELETE FROM project_minhash WHERE project_id IN ({placeholders})", list(project_ids))
+
+
+# Function to list projects whose text looks like a near copy of this one.
+# Returns [{'project_id', 'Title', 'similarity'}], most similar first.
+def find_near_duplicates(project_id):
+    if not Config.DUPLICATE_MINHASH:
+        return []
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT signature FROM project_minhash WHERE project_id = %s", (project_id,))
+        row = cursor.fetchone()
+        if not row:
+            return []
+        signature = struct.unpack(f'<{NUM_PERMUTATIONS}I', row['signature'])
+
+        # Candidates share at least one band bucket with this project
+        cursor.execute("""
+            SELECT DISTINCT other.project_id
+            FROM project_minhash_bands mine
+            JOIN project_minhash_bands other ON other.band = mine.band AND other.bucket = mine.bucket
+            WHERE mine.project_id = %s AND other.project_id <> %s
+        """, (project_id, project_id))
+        candidate_ids = [row['project_id'] for row in cursor.fetchall()]
+        if not candidate_ids:
+            return []
+
+        placeholders = ', '.join(['%s'] * len(candidate_ids))
+        cursor.execute(f"""
+            SELECT project_minhash.project_id, project_minhash.signature, project_details.Title
+            FROM project_minhash
+            JOIN project_details ON project_details.project_id = project_minhash.project_id
+            WHERE project_minhash.project_id IN ({placeholders})
+        """, candidate_ids)
+        candidates = cursor.fetchall()
+
+    matches = []
+    for candidate in candidates:
+        similarity = _similarity(signature, struct.unpack(f'<{NUM_PERMUTATIONS}I', candidate['signature']))
+        if similarity >= Config.DUPLICATE_SIMILARITY:
+            matches.append({'project_id': candidate['project_id'], 'Title': candidate['Title'], 'similarity': round(similarity, 2)})
+    matches.sort(key=lambda match: match['similarity'], reverse=True)
+    return matches
+
+
+# Function to fill in metadata_fingerprint for projects created before the column existed
+def backfill_fingerprints(batch_size=500):
+    updated = 0
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(
+                "SELECT project_id, Title, Authors, Publication_Year FROM project_details WHERE metadata_fingerprint IS NULL LIMIT %s",
+                (batch_size,)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return updated
+            cursor.executemany(
+                "UPDATE project_details SET metadata_fingerprint = %s WHERE project_id = %s",
+                [(metadata_fingerprint(title, authors, year), project_id) for project_id, title, authors, year in rows]
+            )
+            conn.commit()
+            updated += len(rows)
+            print(f"Fingerprinted {updated} projects")
+
+
+if __name__ == '__main__':
+    backfill_fingerprints()
@@ -0,0 +1,235 @@
+# extraction.py
+# Page-by-page PDF text extraction.
+#
+# iter_pages() yields (page_number, text) pairs instead of building one big
+# string. Every document is opened and read by a process pool whose workers
+# run under an address-space limit of EXTRACT_MAX_MEMORY_MB, never in the
+# request process. Short documents are one task; documents with at least
+# EXTRACT_PARALLEL_MIN_PAGES pages are split into page ranges read in
+# parallel. Every document gets EXTRACT_TIMEOUT seconds and at most
+# EXTRACT_MAX_CHARS characters of text. Each task also sets a CPU-time limit
+# at the document's deadline, so a worker stuck inside one page is killed
+# (and replaced by the pool) rather than holding its slot. Problems raise
+# ExtractionError rather than being returned as text.
+#
+# Extracted pages are stored in pdf_pages, keyed by the PDF's content hash, so
+# retries and later stages can read them back without reopening the PDF.
+#
+# fitz (PyMuPDF) is imported inside the functions that read PDFs, so importing
+# this module (and the app) doesn't load it until a PDF is actually read.
+import multiprocessing
+import threading
+import time
+
+from config import Config
+from connect import database_connection
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PAGE_INSERT_BATCH = 200
+
+
+class ExtractionError(Exception):
+    """Raised when a PDF cannot be read within the configured limits."""
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _limit_memory(max_bytes):
+    if resource is not None and max_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def _limit_cpu(seconds):
+    """Let this worker use at most `seconds` more CPU time before SIGXCPU ends it."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + max(seconds, 0)) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the web process has threads and open sockets
+                context = multiprocessing.get_context('spawn')
+                _pool = context.Pool(
+                    processes=Config.EXTRACT_WORKERS,
+                    initializer=_limit_memory,
+                    initargs=(Config.EXTRACT_MAX_MEMORY_MB * 1024 * 1024,),
+                    maxtasksperchild=50,
+                )
+    return _pool
+
+
+def _extract_range(args):
+    """Pool task: return [(page_number, text), ...] for pages [start, stop).
+
+    Stops as soon as the document's deadline (wall-clock time, since it is
+    compared across processes) has passed, so the queued tasks of a timed-out
+    document finish right away instead of tying up the shared pool.
+    """
+    path, start, stop, wall_deadline = args
+    _limit_cpu(wall_deadline - time.time())
+    import fitz
+    try:
+        pages = []
+        with fitz.open(path) as document:
+            for page_number in range(start, stop):
+                if time.time() > wall_deadline:
+                    raise ExtractionError(f"Timed out before page {page_number + 1}.")
+                pages.append((page_number + 1, document[page_number].get_text()))
+        return pages
+    except ExtractionError:
+        raise
+    except MemoryError:
+        raise ExtractionError(f"Pages {start + 1}-{stop} exceeded the memory limit.")
+    except Exception as e:
+        raise ExtractionError(f"Error reading pages {start + 1}-{stop}: {e}")
+
+
+def _page_count(path):
+    import fitz
+    try:
+        with fitz.open(path) as document:
+            if document.needs_pass:
+                raise ExtractionError("PDF is password protected.")
+            return document.page_count
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Error opening PDF: {e}")
+
+
+def _count_pages(args):
+    """Pool task: _page_count() under the document's CPU-time limit."""
+    path, wall_deadline = args
+    _limit_cpu(wall_deadline - time.time())
+    return _page_count(path)
+
+
+def _iter_local(path, deadline):
+    import fitz
+    try:
+        with fitz.open(path) as document:
+            for page_number in range(document.page_count):
+                if time.monotonic() > deadline:
+                    raise ExtractionError(f"Timed out after page {page_number}.")
+                yield page_number + 1, document[page_number].get_text()
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Error extracting text: {e}")
+
+
+def _iter_pooled(path, deadline):
+    wall_deadline = time.time() + (deadline - time.monotonic())
+    pool = _get_pool()
+    try:
+        page_count = pool.apply_async(_count_pages, ((path, wall_deadline),)).get(timeout=max(deadline - time.monotonic(), 0))
+    except multiprocessing.TimeoutError:
+        raise ExtractionError(f"Timed out opening the PDF after {Config.EXTRACT_TIMEOUT} seconds.")
+
+    # Short documents are a single task; longer ones are read in parallel ranges
+    step = Config.EXTRACT_PAGES_PER_TASK if page_count >= Config.EXTRACT_PARALLEL_MIN_PAGES else max(page_count, 1)
+    ranges = [(path, start, min(start + step, page_count), wall_deadline) for start in range(0, page_count, step)]
+    results = pool.imap(_extract_range, ranges)
+    for _ in ranges:
+        remaining = deadline - time.monotonic()
+        try:
+            chunk = results.next(timeout=max(remaining, 0))
+        except multiprocessing.TimeoutError:
+            # The pool is shared with other documents, so it is left running;
+            # this document's remaining tasks give up at their deadline check
+            raise ExtractionError(f"Timed out after {Config.EXTRACT_TIMEOUT} seconds.")
+        yield from chunk
+
+
+# Function to yield (page_number, text) for each page of a PDF on disk, in order.
+# parallel=False reads in the calling process, for callers that are already a
+# limited pool worker (extract_many()).
+def iter_pages(path, timeout=None, parallel=True):
+    deadline = time.monotonic() + (timeout or Config.EXTRACT_TIMEOUT)
+    if parallel:
+        pages = _iter_pooled(path, deadline)
+    else:
+        _page_count(path)
+        pages = _iter_local(path, deadline)
+
+    total_chars = 0
+    for page_number, text in pages:
+        total_chars += len(text)
+        if total_chars > Config.EXTRACT_MAX_CHARS:
+            raise ExtractionError(f"Text exceeds {Config.EXTRACT_MAX_CHARS} characters (stopped at page {page_number}).")
+        yield page_number, text
+
+
+def _extract_document(path):
+    """Pool task: return (path, [(page_number, text), ...], error)."""
+    try:
+        return path, list(iter_pages(path, parallel=False)), None
+    except ExtractionError as e:
+        return path, None, str(e)
+    except MemoryError:
+        return path, None, "Exceeded the memory limit."
+
+
+# Function to extract many PDFs at once, one document per worker process.
+# Yields (path, pages, error) as each document finishes; pages is None on error.
+def extract_many(paths, workers=None):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(
+        processes=workers or Config.EXTRACT_WORKERS,
+        initializer=_limit_memory,
+        initargs=(Config.EXTRACT_MAX_MEMORY_MB * 1024 * 1024,),
+        maxtasksperchild=50,
+    ) as pool:
+        yield from pool.imap_unordered(_extract_document, paths)
+
+
+# Function to extract a PDF and store its pages under the PDF's hash, in batches.
+# The text is extracted before a connection is taken from the pool, so the
+# delete and inserts run in one short transaction. Returns the number of pages stored.
+def extract_and_store(path, pdf_hash, timeout=None):
+    rows = [(pdf_hash, page_number, text) for page_number, text in iter_pages(path, timeout)]
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM pdf_pages WHERE pdf_hash = %s", (pdf_hash,))
+        for start in range(0, len(rows), PAGE_INSERT_BATCH):
+            cursor.executemany(
+                "INSERT INTO pdf_pages (pdf_hash, page_number, text) VALUES (%s, %s, %s)",
+                rows[start:start + PAGE_INSERT_BATCH]
+            )
+        conn.commit()
+    return len(rows)
+
+
+# Function to read stored pages back as [(page_number, text), ...]; empty if never extracted
+def get_pages(pdf_hash):
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT page_number, text FROM pdf_pages WHERE pdf_hash = %s ORDER BY page_number", (pdf_hash,))
+        return cursor.fetchall()
+
+
+# Function to get the full text of a stored PDF, extracting it first if needed
+def get_text(path, pdf_hash):
+    pages = get_pages(pdf_hash)
+    if not pages:
+        extract_and_store(path, pdf_hash)
+        pages = get_pages(pdf_hash)
+    text = "".join(text for _, text in pages)
+    if not text.strip():
+        raise ExtractionError("PDF contains no extractable text.")
+    return text
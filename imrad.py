@@ -0,0 +1,219 @@
+# imrad.py
+# IMRaD summary generation for uploaded projects (text extraction is in extraction.py).
+#
+# Model outputs are cached in imrad_cache under a hash of the prompt version,
+# the model name and the input text, so re-uploading a PDF or regenerating
+# its summary doesn't call the model again. Text longer than IMRAD_CHUNK_CHARS
+# is split into chunks that are summarized in parallel (at most
+# IMRAD_MAP_CONCURRENCY model calls at once across all jobs), and the chunk
+# summaries are then merged into the four IMRaD paragraphs.
+#
+# The Google client library and the Gemini model are created on the first
+# model call, not at import, so starting a worker (or importing the app in a
+# script) doesn't pay for them. The client reads its API key from the
+# GOOGLE_API_KEY environment variable; no credentials are kept in the source.
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from connect import database_connection
+
+
+GEMINI_MODEL = "gemini-1.5-flash-002"
+
+
+# Bump when IMRAD_PROMPT or CHUNK_PROMPT changes so cached outputs are not reused
+PROMPT_VERSION = 2
+
+# Rounds of chunk summarizing before the remaining text is truncated to fit
+MAX_REDUCE_ROUNDS = 3
+
+IMRAD_PROMPT = "Summarize the PDF in IMRaD(Introduction, Method, Results, and Discussion) format. Make it in only 4 paragraphs and make each paragraph long and don't include words like 'Introduction', 'Method', 'Results', and 'Discussion'. Make each paragraph long."
+
+
+CHUNK_PROMPT = "This is part {part} of {parts} of a capstone thesis. Summarize it in one detailed paragraph, keeping the research problem, methods, results and conclusions it describes"
+
+
+class GeminiModelClient:
+    """Model client backed by a Gemini GenerativeModel, created on the first call."""
+
+    def __init__(self, model_name=GEMINI_MODEL):
+        self.model_name = model_name
+        self.name = f"models/{model_name}"  # Matches GenerativeModel.model_name, used in cache keys
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt).text
+
+
+class StubModelClient:
+    """Offline model client for tests and local development.
+
+    Returns four paragraphs built from the start of the prompt text, so
+    the pipeline can run without network access or credentials.
+    """
+
+    name = 'stub'
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        words = prompt.split()
+        excerpt = " ".join(words[:40])
+        return "\n\n".join(f"[stub paragraph {i}] {excerpt}" for i in range(1, 5))
+
+
+_model_client = None
+
+
+# Function to get the model client selected by Config.IMRAD_MODEL_CLIENT ('gemini' or 'stub')
+def get_model_client():
+    global _model_client
+    if _model_client is None:
+        if Config.IMRAD_MODEL_CLIENT == 'stub':
+            _model_client = StubModelClient()
+        else:
+            _model_client = GeminiModelClient()
+    return _model_client
+
+
+# Function to swap in a different model client (e.g. a StubModelClient in tests)
+def set_model_client(client):
+    global _model_client
+    _model_client = client
+
+
+_map_executor = None
+_map_executor_lock = threading.Lock()
+
+
+def _get_map_executor():
+    global _map_executor
+    if _map_executor is None:
+        with _map_executor_lock:
+            if _map_executor is None:
+                _map_executor = ThreadPoolExecutor(max_workers=Config.IMRAD_MAP_CONCURRENCY, thread_name_prefix='imrad-map')
+    return _map_executor
+
+
+def _cache_key(client, kind, text):
+    key = f"{PROMPT_VERSION}\0{client.name}\0{kind}\0{text}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _cache_get(key):
+    try:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT output FROM imrad_cache WHERE cache_key = %s", (key,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"Error reading IMRaD cache: {e}")
+        return None
+
+
+def _cache_put(key, output):
+    try:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("REPLACE INTO imrad_cache (cache_key, output) VALUES (%s, %s)", (key, output))
+            conn.commit()
+    except Exception as e:
+        print(f"Error writing IMRaD cache: {e}")
+
+
+def _generate_cached(client, kind, text, prompt):
+    key = _cache_key(client, kind, text)
+    output = _cache_get(key)
+    if output is None:
+        output = client.generate(prompt)
+        _cache_put(key, output)
+    return output
+
+
+def _split(text, size):
+    """Split text into chunks of at most size characters, preferring paragraph and line breaks."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            for separator in ("\n\n", "\n", " "):
+                cut = text.rfind(separator, start + size // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def _summarize_chunks(client, text):
+    chunks = _split(text, Config.IMRAD_CHUNK_CHARS)
+    # The prompt names the chunk's position, so the position is part of the cache key
+    futures = [
+        _get_map_executor().submit(
+            _generate_cached, client, f'chunk {part}/{len(chunks)}', chunk,
+            f"{CHUNK_PROMPT.format(part=part, parts=len(chunks))}: {chunk}"
+        )
+        for part, chunk in enumerate(chunks, start=1)
+    ]
+    return "\n\n".join(future.result() for future in futures)
+
+
+# Function to generate the four IMRaD paragraphs for a document's text.
+# Long text is summarized chunk by chunk first; every model output is cached.
+def generate_imrad(text):
+    client = get_model_client()
+    key = _cache_key(client, 'imrad', text)
+    output = _cache_get(key)
+    if output is not None:
+        return output
+
+    condensed = text
+    for _ in range(MAX_REDUCE_ROUNDS):
+        if len(condensed) <= Config.IMRAD_CHUNK_CHARS:
+            break
+        condensed = _summarize_chunks(client, condensed)
+    condensed = condensed[:Config.IMRAD_CHUNK_CHARS]
+
+    output = client.generate(f"{IMRAD_PROMPT}: {condensed}")
+    _cache_put(key, output)
+    return output
+
+def save_generated_imrad_and_spacing(project_id, imrad_text):
+    try:
+        # Replace line breaks with <br> tags for proper HTML rendering
+        imrad_with_spacing = imrad_text.replace("\n", "<br>")
+
+        with database_connection() as connection:
+            cursor = connection.cursor()
+
+            # Update the project details to include the generated IMRaD with HTML line breaks
+            query = """
+            UPDATE project_details 
+            SET generated_imrad = %s 
+            WHERE project_id = %s
+            """
+            cursor.execute(query, (imrad_with_spacing, project_id))
+
+            connection.commit()
+
+        return "Success"
+    
+    except Exception as e:
+        return f"Error saving IMRaD to database: {str(e)}"
@@ -0,0 +1,203 @@
+# ingest.py
+# Bulk import of capstone projects from a directory of PDFs and a manifest.
+#
+#   python ingest.py <pdf_dir> <manifest.csv|manifest.json> [--chunk-size N] [--workers N]
+#
+# The manifest has one entry per project with the columns/keys file, title,
+# authors, major, year, keywords and abstract (file is relative to pdf_dir).
+#
+# Every PDF is copied into the PDF store first. Entries whose PDF is already
+# attached to a project are skipped, which is also how an interrupted run
+# resumes: committed chunks are recognised by their pdf_hash. As on upload,
+# entries with the same title, authors and year as an existing project (or an
+# earlier manifest entry) are rejected as duplicates. The remaining PDFs are
+# extracted in parallel and written CHUNK_SIZE projects at a time, each chunk
+# in one transaction with executemany inserts. Imported projects are left
+# 'pending' for the IMRaD workers. An app process only queues pending jobs when
+# it starts, so while the app is running, summarize them with `python jobs.py`.
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from config import Config
+from connect import database_connection
+import duplicates
+import extraction
+import jobs
+import page_cache
+import pdf_store
+import stats
+
+CHUNK_SIZE = 100
+MANIFEST_FIELDS = ('file', 'title', 'authors', 'major', 'year', 'keywords', 'abstract')
+
+
+# Function to read a CSV or JSON manifest into a list of dicts with MANIFEST_FIELDS keys
+def load_manifest(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if path.lower().endswith('.json'):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    entries = []
+    for row in rows:
+        row = {str(key).strip().lower(): value for key, value in row.items()}
+        entries.append({field: (str(row.get(field) or '')).strip() for field in MANIFEST_FIELDS})
+    return entries
+
+
+def _existing_hashes(hashes):
+    """Return the subset of hashes already attached to a project."""
+    existing = set()
+    hashes = list(hashes)
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"SELECT pdf_hash FROM project_details WHERE pdf_hash IN ({placeholders})", batch)
+            existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def _existing_fingerprints(fingerprints):
+    """Return {metadata_fingerprint: Title} for the fingerprints that already belong to a project."""
+    existing = {}
+    fingerprints = list(fingerprints)
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(fingerprints), 500):
+            batch = fingerprints[start:start + 500]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"SELECT metadata_fingerprint, Title FROM project_details WHERE metadata_fingerprint IN ({placeholders})", batch)
+            existing.update(cursor.fetchall())
+    return existing
+
+
+def _store_files(entries, pdf_dir, failures):
+    """Copy each entry's PDF into the store. Returns {pdf_hash: entry} for new PDFs, and the skip count."""
+    by_hash = {}
+    for entry in entries:
+        if not entry['file'] or not entry['title']:
+            failures.append((entry['file'], "Missing file or title in manifest."))
+            continue
+        path = os.path.join(pdf_dir, entry['file'])
+        try:
+            with open(path, 'rb') as f:
+                pdf_hash = pdf_store.store_pdf_stream(f)
+        except OSError as e:
+            failures.append((entry['file'], f"Could not read PDF: {e}"))
+            continue
+        if pdf_hash in by_hash:
+            failures.append((entry['file'], f"Same PDF as {by_hash[pdf_hash]['file']}."))
+            continue
+        by_hash[pdf_hash] = entry
+
+    existing = _existing_hashes(by_hash)
+    for pdf_hash in existing:
+        del by_hash[pdf_hash]
+
+    # Same title, authors and year as a project or an earlier entry, checked like an upload.
+    # The PDFs of rejected entries aren't attached to any project, so they leave the store.
+    by_fingerprint = {}  # metadata_fingerprint -> pdf_hash
+    for pdf_hash, entry in list(by_hash.items()):
+        entry['fingerprint'] = duplicates.metadata_fingerprint(entry['title'], entry['authors'], entry['year'])
+        first = by_fingerprint.setdefault(entry['fingerprint'], pdf_hash)
+        if first != pdf_hash:
+            failures.append((entry['file'], f"Same title, authors and year as {by_hash[first]['file']}."))
+            pdf_store.delete_pdf(pdf_hash)
+            del by_hash[pdf_hash]
+    for fingerprint, title in _existing_fingerprints(by_fingerprint).items():
+        pdf_hash = by_fingerprint[fingerprint]
+        failures.append((by_hash[pdf_hash]['file'], f"Project already exists (same title, authors and year: {title})."))
+        pdf_store.delete_pdf(pdf_hash)
+        del by_hash[pdf_hash]
+    return by_hash, len(existing)
+
+
+def _write_chunk(chunk):
+    """Insert a chunk of (pdf_hash, entry, pages) in one transaction."""
+    projects = [
+        (entry['title'], entry['authors'], entry['year'] or None, entry['major'], entry['keywords'],
+         entry['abstract'], pdf_hash, entry['fingerprint'], jobs.STATUS_PENDING)
+        for pdf_hash, entry, _ in chunk
+    ]
+    pages = [(pdf_hash, page_number, text) for pdf_hash, _, doc_pages in chunk for page_number, text in doc_pages]
+
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO project_details (Title, Authors, Publication_Year, Major, Keywords, Abstract, pdf_hash, metadata_fingerprint, imrad_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, projects)
+        for start in range(0, len(pages), extraction.PAGE_INSERT_BATCH):
+            cursor.executemany(
+                "INSERT IGNORE INTO pdf_pages (pdf_hash, page_number, text) VALUES (%s, %s, %s)",
+                pages[start:start + extraction.PAGE_INSERT_BATCH]
+            )
+        stats.adjust_totals(cursor, projects=len(projects))
+        page_cache.bump_generation(cursor)
+        conn.commit()
+    page_cache.generation_committed()
+
+
+def _flush(chunk, failures):
+    """Write a chunk; on failure record every entry in it and carry on. Returns the number imported."""
+    try:
+        _write_chunk(chunk)
+        return len(chunk)
+    except Exception as e:
+        print(f"Error writing chunk: {e}")
+        failures.extend((entry['file'], f"Chunk failed: {e}") for _, entry, _ in chunk)
+        return 0
+
+
+# Function to import every project in a manifest; returns (imported, skipped, failures)
+def ingest(pdf_dir, manifest_path, chunk_size=CHUNK_SIZE, workers=None):
+    started = time.monotonic()
+    entries = load_manifest(manifest_path)
+    failures = []
+
+    print(f"Storing {len(entries)} PDFs in {Config.PDF_STORE_FOLDER}...")
+    new, skipped = _store_files(entries, pdf_dir, failures)
+    print(f"{len(new)} to import, {skipped} already imported, {len(failures)} unreadable.")
+
+    imported = 0
+    chunk = []
+    paths = {pdf_store.pdf_path(pdf_hash): pdf_hash for pdf_hash in new}
+    for path, pages, error in extraction.extract_many(list(paths), workers):
+        pdf_hash = paths[path]
+        if error:
+            failures.append((new[pdf_hash]['file'], error))
+            continue
+        chunk.append((pdf_hash, new[pdf_hash], pages))
+        if len(chunk) >= chunk_size:
+            imported += _flush(chunk, failures)
+            chunk = []
+            elapsed = time.monotonic() - started
+            print(f"[{imported}/{len(new)}] imported, {len(failures)} failed, {imported / elapsed:.1f} projects/s")
+    if chunk:
+        imported += _flush(chunk, failures)
+
+    print(f"Done: {imported} imported, {skipped} skipped, {len(failures)} failed in {time.monotonic() - started:.0f}s.")
+    return imported, skipped, failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bulk import capstone projects from a directory of PDFs.")
+    parser.add_argument('pdf_dir', help="Directory containing the PDFs")
+    parser.add_argument('manifest', help="CSV or JSON manifest with file, title, authors, major, year, keywords, abstract")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Projects per transaction")
+    parser.add_argument('--workers', type=int, default=None, help="Extraction processes (default: EXTRACT_WORKERS)")
+    args = parser.parse_args()
+
+    imported, skipped, failures = ingest(args.pdf_dir, args.manifest, args.chunk_size, args.workers)
+    for file, error in failures:
+        print(f"  {file}: {error}", file=sys.stderr)
+    if imported:
+        print("Run `python jobs.py` to generate IMRaD summaries for the new projects (the app only queues pending jobs when it starts).")
+    sys.exit(1 if failures else 0)
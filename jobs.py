@@ -0,0 +1,170 @@
+# jobs.py
+# Background pipeline that turns an uploaded PDF into its IMRaD summary.
+#
+# project_details.imrad_status is the queue: uploads insert rows as 'pending'
+# and enqueue_imrad() hands them to a small thread pool. A worker claims a row
+# by flipping it to 'processing', extracts the text (reusing stored pages when a
+# retry or another project already extracted the same PDF), calls the model
+# client and saves the summary. Failures are retried with exponential backoff until
+# IMRAD_MAX_ATTEMPTS is reached, then the row is marked 'failed'. The end of each
+# backoff is stored in imrad_next_attempt_at, so a worker resuming jobs after a
+# restart waits it out instead of retrying straight away.
+#
+# Each process starts its thread pool, and resumes pending jobs, on first use:
+# the app calls start_workers() from its first request, so jobs left pending
+# by a restart (or by ingest.py before it) are picked up without waiting for
+# an upload. The pool is recreated after a fork (gunicorn --preload).
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from connect import database_connection
+from imrad import generate_imrad, save_generated_imrad_and_spacing
+import duplicates
+import extraction
+import pdf_store
+
+STATUS_PENDING = 'pending'
+STATUS_PROCESSING = 'processing'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+_executor = None
+_executor_pid = None  # Process the executor was created in; its threads don't survive a fork
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor_pid != pid:
+        with _executor_lock:
+            if _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=Config.IMRAD_WORKERS, thread_name_prefix='imrad')
+                _executor_pid = pid
+                threading.Thread(target=resume_pending, name='imrad-resume', daemon=True).start()
+    return _executor
+
+
+# Function to start this process's IMRaD workers and queue its pending jobs (once per process)
+def start_workers():
+    _get_executor()
+
+
+# Function to queue IMRaD generation for a project, optionally after a delay (seconds)
+def enqueue_imrad(project_id, delay=0):
+    if delay:
+        timer = threading.Timer(delay, enqueue_imrad, args=(project_id,))
+        timer.daemon = True
+        timer.start()
+        return
+    _get_executor().submit(_run, project_id)
+
+
+def _set_status(project_id, status, error=None, retry_after=None):
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE project_details
+            SET imrad_status = %s, imrad_error = %s, imrad_updated_at = NOW(),
+                imrad_next_attempt_at = IF(%s IS NULL, NULL, NOW() + INTERVAL %s SECOND)
+            WHERE project_id = %s
+        """, (status, error, retry_after, retry_after, project_id))
+        conn.commit()
+
+
+def _claim(project_id):
+    """Mark a pending job as processing. Returns the attempt number, or None if another worker has it."""
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE project_details
+            SET imrad_status = %s, imrad_attempts = imrad_attempts + 1, imrad_updated_at = NOW()
+            WHERE project_id = %s AND imrad_status = %s
+        """, (STATUS_PROCESSING, project_id, STATUS_PENDING))
+        claimed = cursor.rowcount == 1
+        conn.commit()
+        if not claimed:
+            return None
+        cursor.execute("SELECT imrad_attempts FROM project_details WHERE project_id = %s", (project_id,))
+        return cursor.fetchone()[0]
+
+
+def _run(project_id):
+    attempts = _claim(project_id)
+    if attempts is None:
+        return
+
+    try:
+        pdf_path, pdf_hash = pdf_store.get_project_pdf_file(project_id)
+        if pdf_path is None:
+            raise ValueError("PDF file not found.")
+
+        text = extraction.get_text(pdf_path, pdf_hash)
+        try:
+            duplicates.record_signature(project_id, text)
+        except Exception as e:
+            # Near-duplicate warnings are best effort; don't fail the summary over them
+            print(f"Error recording MinHash signature for project {project_id}: {e}")
+
+        imrad_response = generate_imrad(text)
+
+        save_result = save_generated_imrad_and_spacing(project_id, imrad_response)
+        if save_result != "Success":
+            raise RuntimeError(save_result)
+
+        _set_status(project_id, STATUS_DONE)
+    except Exception as e:
+        print(f"IMRaD job for project {project_id} failed (attempt {attempts}): {e}")
+        try:
+            if attempts < Config.IMRAD_MAX_ATTEMPTS:
+                delay = Config.IMRAD_RETRY_BACKOFF * 2 ** (attempts - 1)
+                _set_status(project_id, STATUS_PENDING, str(e), retry_after=int(delay))
+                enqueue_imrad(project_id, delay=delay)
+            else:
+                _set_status(project_id, STATUS_FAILED, str(e))
+        except Exception as status_error:
+            print(f"Error updating IMRaD job status for project {project_id}: {status_error}")
+
+
+# Function to get the IMRaD job status of a project for the polling endpoint
+def get_job_status(project_id):
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT project_id, imrad_status AS status, imrad_attempts AS attempts, imrad_error AS error
+            FROM project_details WHERE project_id = %s
+        """, (project_id,))
+        return cursor.fetchone()
+
+
+# Function to pick up jobs left behind by a restart: stale 'processing' rows go back
+# to 'pending', and every pending row is queued again once its retry time has passed.
+# Several workers may queue the same row; only the one whose _claim() succeeds runs it.
+def resume_pending():
+    try:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE project_details SET imrad_status = %s
+                WHERE imrad_status = %s AND imrad_updated_at < NOW() - INTERVAL %s SECOND
+            """, (STATUS_PENDING, STATUS_PROCESSING, Config.IMRAD_STALE_AFTER))
+            conn.commit()
+            cursor.execute("""
+                SELECT project_id, GREATEST(COALESCE(TIMESTAMPDIFF(SECOND, NOW(), imrad_next_attempt_at), 0), 0)
+                FROM project_details WHERE imrad_status = %s
+            """, (STATUS_PENDING,))
+            jobs = cursor.fetchall()
+    except Exception as e:
+        print(f"Error resuming IMRaD jobs: {e}")
+        return
+
+    for project_id, wait in jobs:
+        enqueue_imrad(project_id, delay=wait)
+
+
+if __name__ == '__main__':
+    # Run as a standalone worker: drain pending jobs, then wait for retries
+    _get_executor()
+    threading.Event().wait()
@@ -0,0 +1,181 @@
+# metrics.py
+# Per-endpoint request latency and database query metrics, in Prometheus text format.
+#
+# init_app() times every request and tracks the queries it runs through the
+# instrumented cursors in connect.py. Results are aggregated per endpoint
+# into latency and queries-per-request histograms, plus total query time,
+# and served by /admin/metrics. Requests that repeat a statement (N+1) or
+# open too many connections are logged and counted as flagged. Counters are
+# per process: scrape each worker, or sum them in Prometheus.
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, abort, g, request
+
+from config import Config
+import connect
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.statuses = {}  # "2xx" -> count
+        self.flagged = 0
+        self.slow_queries = 0
+
+
+_lock = threading.Lock()
+_endpoints = {}  # (endpoint, method) -> EndpointMetrics
+
+
+# Function to add one finished request to the aggregates
+def record_request(endpoint, method, status, duration, query_count, query_seconds, flagged=False, slow_queries=0):
+    key = (endpoint or 'unmatched', method)
+    status_class = f"{status // 100}xx"
+    with _lock:
+        metrics = _endpoints.get(key)
+        if metrics is None:
+            metrics = _endpoints[key] = EndpointMetrics()
+        metrics.latency.observe(duration)
+        metrics.queries.observe(query_count)
+        metrics.query_seconds += query_seconds
+        metrics.statuses[status_class] = metrics.statuses.get(status_class, 0) + 1
+        metrics.flagged += int(flagged)
+        metrics.slow_queries += slow_queries
+
+
+# Function to get (requests, database queries) summed over every endpoint
+def totals():
+    with _lock:
+        return (sum(metrics.queries.count for metrics in _endpoints.values()),
+                sum(metrics.queries.sum for metrics in _endpoints.values()))
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_token = connect.start_query_tracking()
+
+
+def _after_request(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def _teardown_request(error=None):
+    token = g.pop('metrics_token', None)
+    if token is None:
+        return
+    tracker = connect.stop_query_tracking(token)
+    duration = time.perf_counter() - g.pop('metrics_started')
+    status = g.pop('metrics_status', 500 if error else 200)
+
+    problems = tracker.problems()
+    if problems:
+        logger.warning("%s %s (%s): %s", request.method, request.path, request.endpoint, "; ".join(problems))
+    record_request(request.endpoint, request.method, status, duration, tracker.count, tracker.total_time,
+                   flagged=bool(problems), slow_queries=tracker.slow_queries)
+
+
+# Function to render every aggregate in Prometheus text exposition format
+def render():
+    lines = [
+        '# HELP capsarc_request_duration_seconds Request latency by endpoint.',
+        '# TYPE capsarc_request_duration_seconds histogram',
+    ]
+    with _lock:
+        items = sorted(_endpoints.items())
+        for (endpoint, method), metrics in items:
+            lines.extend(metrics.latency.lines('capsarc_request_duration_seconds', f'endpoint="{endpoint}",method="{method}"'))
+
+        lines += [
+            '# HELP capsarc_request_queries Database queries per request by endpoint.',
+            '# TYPE capsarc_request_queries histogram',
+        ]
+        for (endpoint, method), metrics in items:
+            lines.extend(metrics.queries.lines('capsarc_request_queries', f'endpoint="{endpoint}",method="{method}"'))
+
+        lines += [
+            '# HELP capsarc_request_query_seconds_total Time spent in database queries by endpoint.',
+            '# TYPE capsarc_request_query_seconds_total counter',
+        ]
+        for (endpoint, method), metrics in items:
+            lines.append(f'capsarc_request_query_seconds_total{{endpoint="{endpoint}",method="{method}"}} {metrics.query_seconds}')
+
+        lines += [
+            '# HELP capsarc_slow_queries_total Queries over SLOW_QUERY_THRESHOLD_MS by endpoint.',
+            '# TYPE capsarc_slow_queries_total counter',
+        ]
+        for (endpoint, method), metrics in items:
+            lines.append(f'capsarc_slow_queries_total{{endpoint="{endpoint}",method="{method}"}} {metrics.slow_queries}')
+
+        lines += [
+            '# HELP capsarc_flagged_requests_total Requests that repeated a query or opened too many connections.',
+            '# TYPE capsarc_flagged_requests_total counter',
+        ]
+        for (endpoint, method), metrics in items:
+            lines.append(f'capsarc_flagged_requests_total{{endpoint="{endpoint}",method="{method}"}} {metrics.flagged}')
+
+        lines += [
+            '# HELP capsarc_requests_total Requests by endpoint and status class.',
+            '# TYPE capsarc_requests_total counter',
+        ]
+        for (endpoint, method), metrics in items:
+            for status_class, count in sorted(metrics.statuses.items()):
+                lines.append(f'capsarc_requests_total{{endpoint="{endpoint}",method="{method}",status="{status_class}"}} {count}')
+
+    pool = connect.get_pool().stats()
+    lines += [
+        '# HELP capsarc_db_pool_connections Database pool connections by state.',
+        '# TYPE capsarc_db_pool_connections gauge',
+        f'capsarc_db_pool_connections{{state="in_use"}} {pool["in_use"]}',
+        f'capsarc_db_pool_connections{{state="idle"}} {pool["idle"]}',
+        f'capsarc_db_pool_connections{{state="opened"}} {pool["opened"]}',
+        '# HELP capsarc_db_pool_size Maximum connections in the database pool.',
+        '# TYPE capsarc_db_pool_size gauge',
+        f'capsarc_db_pool_size {pool["size"]}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# /admin/metrics; requires "Authorization: Bearer <METRICS_TOKEN>" when a token is configured
+def metrics_endpoint():
+    if Config.METRICS_TOKEN and request.headers.get('Authorization') != f"Bearer {Config.METRICS_TOKEN}":
+        abort(401)
+    return Response(render(), mimetype='text/plain; version=0.0.4')
+
+
+# Function to install the timing hooks on a Flask app
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
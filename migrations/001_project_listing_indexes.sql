@@ -0,0 +1,6 @@
+-- Indexes backing the SQL-side pagination in user.fetch_project_page().
+-- Listings are ordered by project_id DESC and filtered by year and/or major,
+-- so both the COUNT(*) and the LIMIT/keyset page can be served from an index.
+ALTER TABLE project_details
+    ADD INDEX idx_project_year_id (Publication_Year, project_id),
+    ADD INDEX idx_project_major_id (Major, project_id);
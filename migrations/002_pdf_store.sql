@@ -0,0 +1,7 @@
+-- PDFs now live in the content-addressed file store (pdf_store.py).
+-- pdf_hash is the sha256 of the file; pdf_file is only kept as a migration
+-- source for projects uploaded before the store existed.
+ALTER TABLE project_details
+    ADD COLUMN pdf_hash CHAR(64) NULL,
+    MODIFY pdf_file LONGBLOB NULL,
+    ADD INDEX idx_project_pdf_hash (pdf_hash);
@@ -0,0 +1,8 @@
+-- Background IMRaD generation (jobs.py). imrad_status doubles as the job queue.
+-- Existing projects were summarized at upload time, so they start as 'done'.
+ALTER TABLE project_details
+    ADD COLUMN imrad_status VARCHAR(16) NOT NULL DEFAULT 'done',
+    ADD COLUMN imrad_attempts INT NOT NULL DEFAULT 0,
+    ADD COLUMN imrad_error TEXT NULL,
+    ADD COLUMN imrad_updated_at DATETIME NULL,
+    ADD INDEX idx_project_imrad_status (imrad_status);
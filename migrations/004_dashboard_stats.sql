@@ -0,0 +1,17 @@
+-- Materialized admin dashboard counters (stats.py).
+-- stats.reconcile() fills both tables from the base tables on first use.
+CREATE TABLE IF NOT EXISTS dashboard_stats (
+    id TINYINT NOT NULL PRIMARY KEY,
+    project_count INT NOT NULL DEFAULT 0,
+    user_count INT NOT NULL DEFAULT 0,
+    active_user_count INT NOT NULL DEFAULT 0,
+    reconciled_at DATETIME NULL
+);
+
+INSERT IGNORE INTO dashboard_stats (id) VALUES (1);
+
+CREATE TABLE IF NOT EXISTS project_save_counts (
+    project_id INT NOT NULL PRIMARY KEY,
+    save_count INT NOT NULL DEFAULT 0,
+    INDEX idx_save_count (save_count)
+);
@@ -0,0 +1,8 @@
+-- Per-page text extracted from stored PDFs (extraction.py), keyed by content hash
+-- so projects sharing a PDF, job retries and later stages reuse one extraction.
+CREATE TABLE IF NOT EXISTS pdf_pages (
+    pdf_hash CHAR(64) NOT NULL,
+    page_number INT NOT NULL,
+    text MEDIUMTEXT NOT NULL,
+    PRIMARY KEY (pdf_hash, page_number)
+);
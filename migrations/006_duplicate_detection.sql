@@ -0,0 +1,20 @@
+-- Duplicate detection (duplicates.py). pdf_hash is already indexed (002);
+-- metadata_fingerprint is a sha256 of the normalized title, authors and year.
+-- Fill it in for existing projects with `python duplicates.py`.
+ALTER TABLE project_details
+    ADD COLUMN metadata_fingerprint CHAR(64) NULL,
+    ADD INDEX idx_project_metadata_fingerprint (metadata_fingerprint);
+
+-- MinHash signatures of extracted text, and their LSH band buckets
+CREATE TABLE IF NOT EXISTS project_minhash (
+    project_id INT NOT NULL PRIMARY KEY,
+    signature VARBINARY(256) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS project_minhash_bands (
+    band TINYINT NOT NULL,
+    bucket CHAR(16) NOT NULL,
+    project_id INT NOT NULL,
+    PRIMARY KEY (band, bucket, project_id),
+    INDEX idx_minhash_bands_project (project_id)
+);
@@ -0,0 +1,7 @@
+-- Cached model outputs for IMRaD generation (imrad.py). cache_key is the sha256
+-- of the prompt version, model name, prompt kind and input text.
+CREATE TABLE IF NOT EXISTS imrad_cache (
+    cache_key CHAR(64) NOT NULL PRIMARY KEY,
+    output MEDIUMTEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,10 @@
+-- Catalog generation counter (page_cache.py). Bumped whenever a project is
+-- uploaded, edited or deleted; cached public pages from older generations
+-- are no longer served.
+CREATE TABLE IF NOT EXISTS catalog_generation (
+    id TINYINT NOT NULL PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL
+);
+
+INSERT IGNORE INTO catalog_generation (id, generation, updated_at) VALUES (1, 0, UTC_TIMESTAMP());
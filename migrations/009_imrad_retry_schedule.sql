@@ -0,0 +1,5 @@
+-- Retry schedule for IMRaD jobs (jobs.py). A failed attempt goes back to
+-- 'pending' with imrad_next_attempt_at set to when its backoff ends; resuming
+-- workers wait until then instead of retrying straight away.
+ALTER TABLE project_details
+    ADD COLUMN imrad_next_attempt_at DATETIME NULL;
@@ -0,0 +1,4 @@
+-- The admin active users page lists users by users.last_active, which the
+-- presence flusher (presence.py) writes for every worker process.
+ALTER TABLE users
+    ADD INDEX idx_users_last_active (last_active);
@@ -0,0 +1,114 @@
+# page_cache.py
+# Rendered-page cache for anonymous visitors.
+#
+# Anonymous visitors all see the same public pages, so cached_page() keeps the
+# rendered body per endpoint and normalized query string, answers with an
+# ETag and Last-Modified, and returns 304 when the browser already has it.
+# Logged-in users (and requests with pending flash messages) always get a
+# fresh render.
+#
+# Entries are tied to the catalog generation, a counter in catalog_generation
+# that is bumped in the same transaction as any project upload, edit or
+# delete. Each process re-reads it at most every CATALOG_GENERATION_TTL
+# seconds (immediately after its own bumps are committed), so other workers pick up changes
+# within that window.
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import make_response, request, session
+
+from config import Config
+from connect import database_connection
+
+_lock = threading.Lock()
+_pages = OrderedDict()  # (endpoint, args, generation) -> (body, mimetype, etag, last_modified)
+_generation = (0, None)  # (generation, updated_at)
+_generation_read_at = 0.0
+
+
+# Function to bump the catalog generation using the caller's cursor (and transaction).
+# Call generation_committed() after the commit so this process sees the new value.
+def bump_generation(cursor):
+    cursor.execute("UPDATE catalog_generation SET generation = generation + 1, updated_at = UTC_TIMESTAMP() WHERE id = 1")
+
+
+# Function to re-read the generation on the next request in this process, once a bump is committed.
+# Resetting it before the commit would let a request in between cache pages under the old generation.
+def generation_committed():
+    global _generation_read_at
+    _generation_read_at = 0.0
+
+
+# Function to get (generation, updated_at), re-reading it every CATALOG_GENERATION_TTL seconds
+def get_generation():
+    global _generation, _generation_read_at
+    if time.monotonic() - _generation_read_at > Config.CATALOG_GENERATION_TTL:
+        try:
+            with database_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT generation, updated_at FROM catalog_generation WHERE id = 1")
+                row = cursor.fetchone()
+            _generation = (row[0], row[1]) if row else (0, None)
+        except Exception as e:
+            print(f"Error reading catalog generation: {e}")
+        _generation_read_at = time.monotonic()
+    return _generation
+
+
+def _normalized_args():
+    """Query args as a sorted tuple, ignoring blank values so ?q=&page=1 matches ?page=1."""
+    return tuple(sorted((key, value.strip()) for key, value in request.args.items(multi=True) if value.strip()))
+
+
+def _is_anonymous():
+    return 'username' not in session and '_flashes' not in session
+
+
+def _store(key, entry):
+    with _lock:
+        _pages[key] = entry
+        _pages.move_to_end(key)
+        while len(_pages) > Config.PAGE_CACHE_SIZE:
+            _pages.popitem(last=False)
+
+
+# Decorator for public views: serve anonymous visitors from the cache, with conditional GET
+def cached_page(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'GET' or not _is_anonymous():
+            return view(*args, **kwargs)
+
+        generation, updated_at = get_generation()
+        key = (request.endpoint, _normalized_args(), generation)
+        with _lock:
+            entry = _pages.get(key)
+            if entry is not None:
+                _pages.move_to_end(key)
+
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            body = response.get_data()
+            etag = hashlib.md5(body).hexdigest()
+            last_modified = (updated_at.replace(tzinfo=timezone.utc) if updated_at else datetime.now(timezone.utc))
+            entry = (body, response.mimetype, etag, last_modified)
+            _store(key, entry)
+
+        body, mimetype, etag, last_modified = entry
+        response = make_response(body)
+        response.mimetype = mimetype
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        # Browsers revalidate every time; shared caches must not hand this to logged-in users
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
+
+    return wrapper
@@ -0,0 +1,151 @@
+# page_images.py
+# Server-side rendering of PDF pages to PNG, with an on-disk LRU cache.
+#
+# The viewer requests one page at a time at the scale it needs (or a small
+# thumbnail) instead of downloading and rasterizing the whole PDF in the
+# browser. Rendered pages are saved under PAGE_IMAGE_FOLDER keyed by PDF hash,
+# page number and scale. A cache hit refreshes the file's mtime; once the
+# folder grows past PAGE_IMAGE_CACHE_MB the least recently used files are
+# deleted. PyMuPDF is only imported once a page is first rendered.
+import functools
+import os
+import tempfile
+import threading
+
+from config import Config
+import pdf_store
+
+# Scales are rounded to this step so the cache holds a bounded set of sizes;
+# it is also the smallest scale, used for thumbnails
+SCALE_STEP = 0.25
+
+_lock = threading.Lock()
+_cache_bytes = None
+
+
+class PageNotFound(Exception):
+    """Raised when the requested page doesn't exist in the PDF."""
+
+
+# Function to clamp and round a requested scale to one the cache stores
+def normalize_scale(scale):
+    try:
+        scale = float(scale)
+    except (TypeError, ValueError):
+        scale = 1.0
+    scale = min(max(scale, SCALE_STEP), Config.PAGE_IMAGE_MAX_SCALE)
+    return round(scale / SCALE_STEP) * SCALE_STEP
+
+
+# Function to get [(width, height), ...] in points for every page of a stored PDF
+@functools.lru_cache(maxsize=256)
+def page_sizes(pdf_hash):
+    source = pdf_store.pdf_path(pdf_hash)
+    if source is None:
+        raise PageNotFound("PDF file not found.")
+    import fitz
+    with fitz.open(source) as document:
+        return tuple((page.rect.width, page.rect.height) for page in document)
+
+
+def _image_path(pdf_hash, page_number, scale):
+    return os.path.join(Config.PAGE_IMAGE_FOLDER, pdf_hash[:2], f"{pdf_hash}-p{page_number}-s{scale:g}.png")
+
+
+def _folder_size():
+    total = 0
+    for root, _, files in os.walk(Config.PAGE_IMAGE_FOLDER):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _evict():
+    """Delete least recently used images until the cache is under 90% of its limit."""
+    global _cache_bytes
+    entries = []
+    for root, _, files in os.walk(Config.PAGE_IMAGE_FOLDER):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    total = sum(size for _, size, _ in entries)
+    target = Config.PAGE_IMAGE_CACHE_MB * 1024 * 1024 * 0.9
+    for _, size, path in entries:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    _cache_bytes = total
+
+
+def _account(size):
+    global _cache_bytes
+    with _lock:
+        if _cache_bytes is None:
+            _cache_bytes = _folder_size()
+        else:
+            _cache_bytes += size
+        if _cache_bytes > Config.PAGE_IMAGE_CACHE_MB * 1024 * 1024:
+            _evict()
+
+
+# Function to delete every rendered page of a PDF that is no longer stored
+def forget_pdf(pdf_hash):
+    global _cache_bytes
+    folder = os.path.join(Config.PAGE_IMAGE_FOLDER, pdf_hash[:2])
+    try:
+        names = [name for name in os.listdir(folder) if name.startswith(pdf_hash + '-')]
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(folder, name)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            continue
+        with _lock:
+            if _cache_bytes is not None:
+                _cache_bytes -= size
+    page_sizes.cache_clear()
+
+
+# Function to get the path of a page rendered as PNG (page_number is 1-based), rendering it if needed
+def render_page(pdf_hash, page_number, scale):
+    scale = normalize_scale(scale)
+    path = _image_path(pdf_hash, page_number, scale)
+    try:
+        os.utime(path)  # Mark as recently used
+        return path
+    except FileNotFoundError:
+        pass
+
+    source = pdf_store.pdf_path(pdf_hash)
+    if source is None:
+        raise PageNotFound("PDF file not found.")
+    import fitz
+    with fitz.open(source) as document:
+        if not 1 <= page_number <= document.page_count:
+            raise PageNotFound(f"Page {page_number} does not exist.")
+        pixmap = document[page_number - 1].get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        data = pixmap.tobytes("png")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+    with os.fdopen(fd, 'wb') as tmp:
+        tmp.write(data)
+    os.replace(tmp_path, path)
+    _account(len(data))
+    return path
@@ -0,0 +1,76 @@
+# passwords.py
+# bcrypt hashing and verification on a dedicated, bounded thread pool.
+#
+# bcrypt releases the GIL while it works, so a small pool spreads a login
+# burst across cores. The semaphore caps how many hashes may be running or
+# queued at once so a burst can't pile up unbounded work; callers past the
+# cap wait up to BCRYPT_QUEUE_TIMEOUT seconds and then get HasherBusy.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from config import Config
+
+
+class HasherBusy(Exception):
+    """Raised when the password hashing pool is saturated."""
+
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(Config.BCRYPT_WORKERS + Config.BCRYPT_MAX_QUEUED)
+                _executor = ThreadPoolExecutor(max_workers=Config.BCRYPT_WORKERS, thread_name_prefix='bcrypt')
+    return _executor
+
+
+def _run(fn, *args):
+    executor = _get_executor()
+    if not _slots.acquire(timeout=Config.BCRYPT_QUEUE_TIMEOUT):
+        raise HasherBusy("Too many logins in progress. Please try again.")
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def _to_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+# Function to hash a password at the configured cost; returns the hash as a str
+def hash_password(password, rounds=None):
+    salt = bcrypt.gensalt(rounds=rounds or Config.BCRYPT_ROUNDS)
+    return _run(bcrypt.hashpw, _to_bytes(password), salt).decode('utf-8')
+
+
+# Function to check a password against a stored bcrypt hash
+def verify_password(password, stored_hash):
+    if not stored_hash:
+        return False
+    try:
+        return _run(bcrypt.checkpw, _to_bytes(password), _to_bytes(stored_hash))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+# Function to read the cost factor out of a stored hash ("$2b$12$..." -> 12)
+def hash_cost(stored_hash):
+    try:
+        return int(_to_bytes(stored_hash).split(b'$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+# Function to tell whether a stored hash should be replaced with one at the configured cost
+def needs_rehash(stored_hash):
+    return hash_cost(stored_hash) != Config.BCRYPT_ROUNDS
@@ -0,0 +1,130 @@
+# pdf_store.py
+# Content-addressed file store for project PDFs.
+#
+# Each PDF is saved once under PDF_STORE_FOLDER/<first two hex chars>/<sha256>.pdf
+# and project_details.pdf_hash points at it. The old pdf_file BLOB is left in
+# place, but is only read to migrate projects uploaded before the store existed.
+import hashlib
+import os
+import tempfile
+
+from config import Config
+from connect import database_connection
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _path_for(digest):
+    return os.path.join(Config.PDF_STORE_FOLDER, digest[:2], digest + '.pdf')
+
+
+def _write(chunks):
+    """Hash and write chunks to a temp file, then move it into place. Returns the sha256 hex digest."""
+    os.makedirs(Config.PDF_STORE_FOLDER, exist_ok=True)
+    sha = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=Config.PDF_STORE_FOLDER, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in chunks:
+                sha.update(chunk)
+                tmp.write(chunk)
+        digest = sha.hexdigest()
+        path = _path_for(digest)
+        if os.path.exists(path):
+            os.remove(tmp_path)  # Same content is already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return digest
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Function to store PDF bytes and return their content hash
+def store_pdf(data):
+    return _write([data])
+
+
+# Function to store an uploaded file without reading it into memory at once
+def store_pdf_stream(file):
+    file.seek(0)
+    digest = _write(iter(lambda: file.read(CHUNK_SIZE), b''))
+    file.seek(0)
+    return digest
+
+
+# Function to get the on-disk path of a stored PDF, or None if it is missing
+def pdf_path(digest):
+    if not digest:
+        return None
+    path = _path_for(digest)
+    return path if os.path.exists(path) else None
+
+
+# Function to remove a stored PDF once no project points at it
+def delete_pdf(digest):
+    try:
+        os.remove(_path_for(digest))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+# Function to copy one project's pdf_file BLOB into the store and point pdf_hash at it
+def migrate_project_blob(cursor, project_id):
+    cursor.execute("SELECT pdf_file FROM project_details WHERE project_id = %s", (project_id,))
+    row = cursor.fetchone()
+    if not row or not row[0]:
+        return None
+    digest = store_pdf(row[0])
+    cursor.execute("UPDATE project_details SET pdf_hash = %s WHERE project_id = %s", (digest, project_id))
+    return digest
+
+
+# Function to find a project's stored PDF (by ID or title).
+# Returns (path, digest), migrating the BLOB on first access if needed.
+def get_project_pdf_file(identifier):
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            project_id = int(identifier)
+            cursor.execute("SELECT project_id, pdf_hash FROM project_details WHERE project_id = %s", (project_id,))
+        except ValueError:
+            cursor.execute("SELECT project_id, pdf_hash FROM project_details WHERE Title = %s", (identifier,))
+        row = cursor.fetchone()
+        if not row:
+            return None, None
+
+        project_id, digest = row
+        path = pdf_path(digest)
+        if path is None:
+            digest = migrate_project_blob(cursor, project_id)
+            conn.commit()
+            path = pdf_path(digest)
+    return path, digest
+
+
+# Function to move every remaining pdf_file BLOB into the store, a batch at a time
+def migrate_blobs(batch_size=20):
+    migrated = 0
+    while True:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT project_id FROM project_details WHERE pdf_hash IS NULL AND LENGTH(pdf_file) > 0 LIMIT %s",
+                (batch_size,)
+            )
+            project_ids = [row[0] for row in cursor.fetchall()]
+            if not project_ids:
+                return migrated
+            for project_id in project_ids:
+                migrate_project_blob(cursor, project_id)
+            conn.commit()
+        migrated += len(project_ids)
+        print(f"Migrated {migrated} PDFs to {Config.PDF_STORE_FOLDER}")
+
+
+if __name__ == '__main__':
+    migrate_blobs()
@@ -0,0 +1,132 @@
+# presence.py
+# In-memory presence tracking with write-behind flushes to the users table.
+#
+# Logins, logouts and heartbeats only touch dictionaries here. A daemon thread
+# flushes them every PRESENCE_FLUSH_INTERVAL seconds: status changes and
+# last_active timestamps go to MySQL with one executemany each, in a single
+# transaction. The active users page reads users.last_active, so it covers
+# every worker process, and merges in the heartbeats this process hasn't
+# flushed yet (active_user_ids()).
+import atexit
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+from connect import database_connection
+import stats
+
+_lock = threading.Lock()
+_heartbeats = {}       # user_id -> (monotonic time, datetime) of the latest request
+_pending_seen = {}     # user_id -> datetime not yet written to last_active
+_pending_status = {}   # user_id -> 'active' or None, latest login/logout not yet written
+_flusher = None
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is None:
+        with _lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_forever, name='presence-flush', daemon=True)
+                _flusher.start()
+                atexit.register(flush)
+
+
+# Function to record that a user made a request
+def heartbeat(user_id):
+    if user_id is None:
+        return
+    _start_flusher()
+    now = datetime.now()
+    with _lock:
+        _heartbeats[user_id] = (time.monotonic(), now)
+        _pending_seen[user_id] = now
+
+
+# Function to mark a user as logged in
+def user_logged_in(user_id):
+    heartbeat(user_id)
+    with _lock:
+        _pending_status[user_id] = 'active'
+
+
+# Function to mark a user as logged out
+def user_logged_out(user_id):
+    if user_id is None:
+        return
+    _start_flusher()
+    with _lock:
+        _heartbeats.pop(user_id, None)
+        _pending_status[user_id] = None
+
+
+# Function to drop everything pending for deleted users, so a later flush doesn't touch them
+def forget_users(user_ids):
+    with _lock:
+        for user_id in user_ids:
+            _heartbeats.pop(user_id, None)
+            _pending_seen.pop(user_id, None)
+            _pending_status.pop(user_id, None)
+
+
+# Function to list (user_id, last seen datetime) for users seen within the window, most recent first
+def active_user_ids(window=None):
+    cutoff = time.monotonic() - (window or Config.PRESENCE_WINDOW)
+    with _lock:
+        recent = [(user_id, seen) for user_id, (tick, seen) in _heartbeats.items() if tick >= cutoff]
+    recent.sort(key=lambda item: item[1], reverse=True)
+    return recent
+
+
+def _prune():
+    cutoff = time.monotonic() - Config.PRESENCE_WINDOW
+    with _lock:
+        for user_id in [user_id for user_id, (tick, _) in _heartbeats.items() if tick < cutoff]:
+            del _heartbeats[user_id]
+
+
+# Function to write pending status changes and last_active timestamps to the database
+def flush():
+    global _pending_seen, _pending_status
+    with _lock:
+        seen, _pending_seen = _pending_seen, {}
+        status, _pending_status = _pending_status, {}
+    if not seen and not status:
+        return
+
+    logins = [(user_id,) for user_id, value in status.items() if value == 'active']
+    logouts = [(user_id,) for user_id, value in status.items() if value is None]
+    try:
+        with database_connection() as conn:
+            cursor = conn.cursor()
+            if logins:
+                cursor.executemany(
+                    "UPDATE users SET status = 'active' WHERE user_id = %s AND (status IS NULL OR status <> 'active')",
+                    logins
+                )
+                stats.adjust_totals(cursor, active_users=cursor.rowcount)
+            if logouts:
+                cursor.executemany("UPDATE users SET status = NULL WHERE user_id = %s AND status = 'active'", logouts)
+                stats.adjust_totals(cursor, active_users=-cursor.rowcount)
+            if seen:
+                cursor.executemany(
+                    "UPDATE users SET last_active = %s WHERE user_id = %s",
+                    [(when, user_id) for user_id, when in seen.items()]
+                )
+            conn.commit()
+    except Exception as e:
+        print(f"Error flushing user presence: {e}")
+        # Put the batch back unless newer updates have replaced it
+        with _lock:
+            for user_id, when in seen.items():
+                _pending_seen.setdefault(user_id, when)
+            for user_id, value in status.items():
+                _pending_status.setdefault(user_id, value)
+
+
+def _flush_forever():
+    while True:
+        time.sleep(Config.PRESENCE_FLUSH_INTERVAL)
+        flush()
+        _prune()
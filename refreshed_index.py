@@ -0,0 +1,71 @@
+# refreshed_index.py
+# A process-wide in-memory index that is rebuilt in the background.
+#
+# The first get() builds the index in the calling thread, since there is
+# nothing to serve yet. After that, once the index is older than its refresh
+# interval, get() keeps returning the current index and starts one background
+# thread to build a replacement, which is swapped in with a single reference
+# assignment. Incremental updates made while a rebuild is running are applied
+# to both the current index and, just before the swap, the new one, so edits
+# committed after the rebuild read the table are not lost.
+import threading
+import time
+
+
+class RefreshedIndex:
+    def __init__(self, build, refresh_interval, name='index'):
+        self._build = build  # Function returning a freshly loaded index
+        self._refresh_interval = refresh_interval  # Function returning the refresh interval in seconds
+        self._name = name
+        self._index = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._pending = []  # Updates made during a background rebuild
+
+    def get(self):
+        """Return the current index, building it on first use and refreshing it in the background."""
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build()
+                    self._built_at = time.monotonic()
+                return self._index
+
+        if time.monotonic() - self._built_at > self._refresh_interval() and not self._rebuilding:
+            with self._lock:
+                if not self._rebuilding:
+                    self._rebuilding = True
+                    self._pending = []
+                    threading.Thread(target=self._rebuild, name=f'{self._name}-rebuild', daemon=True).start()
+        return index
+
+    def peek(self):
+        """Return the current index without building it (None if not built yet)."""
+        return self._index
+
+    def apply(self, update):
+        """Run update(index) on the current index, and on the next one if a rebuild is running."""
+        with self._lock:
+            index = self._index
+            if self._rebuilding:
+                self._pending.append(update)
+        if index is not None:
+            update(index)
+
+    def _rebuild(self):
+        try:
+            index = self._build()
+        except Exception as e:
+            print(f"Error rebuilding {self._name}: {e}")
+            index = None
+        with self._lock:
+            if index is not None:
+                for update in self._pending:
+                    update(index)
+                self._index = index
+            # After a failure, wait a full interval before trying again
+            self._built_at = time.monotonic()
+            self._pending = []
+            self._rebuilding = False
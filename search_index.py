@@ -0,0 +1,206 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+from config import Config
+from connect import database_connection
+from refreshed_index import RefreshedIndex
+
+# Field weights used when folding a project's fields into a single document.
+# A hit in the title counts three times as much as a hit in the abstract.
+FIELD_WEIGHTS = {
+    'Title': 3.0,
+    'Keywords': 2.0,
+    'Authors': 2.0,
+    'Abstract': 1.0,
+}
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the
+their this to was were will with using use based towards via
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Suffixes stripped by stem(), longest first. Each entry is (suffix, replacement).
+_SUFFIXES = (
+    ('ational', 'ate'), ('ization', 'ize'), ('fulness', 'ful'), ('iveness', 'ive'),
+    ('ousness', 'ous'), ('ations', 'ate'), ('ation', 'ate'), ('ments', ''), ('ment', ''),
+    ('ities', ''), ('ity', ''), ('ings', ''), ('ing', ''), ('ies', 'y'), ('ied', 'y'),
+    ('ers', ''), ('er', ''), ('ed', ''), ('ly', ''), ('es', ''), ('s', ''),
+)
+
+
+# Function to reduce a word to a crude stem ("systems" -> "system", "monitoring" -> "monitor")
+def stem(word):
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    # "planning" -> "plann" -> "plan"
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+        word = word[:-1]
+    # "manage" and "managing" both end up as "manag"
+    elif len(word) > 4 and word[-1] == 'e':
+        word = word[:-1]
+    return word
+
+
+# Function to split text into normalized, stemmed search terms
+def tokenize(text):
+    if not text:
+        return []
+    return [stem(token) for token in _TOKEN_RE.findall(str(text).lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """In-memory inverted index over project metadata with BM25 ranking.
+
+    Each project is one document whose term frequencies are the
+    field-weighted counts from FIELD_WEIGHTS. Year and major are kept
+    alongside so browse filters can be applied without touching MySQL.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}  # term -> {project_id: weighted tf}
+        self._doc_terms = {}  # project_id -> {term: weighted tf}
+        self._doc_len = {}  # project_id -> weighted length
+        self._doc_meta = {}  # project_id -> (year, major)
+        self._total_len = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_len)
+
+    def add(self, project):
+        project_id = int(project['project_id'])
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(project.get(field)):
+                terms[term] += weight
+
+        try:
+            year = int(project.get('Publication_Year'))
+        except (TypeError, ValueError):
+            year = None
+
+        with self._lock:
+            self._remove(project_id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[project_id] = tf
+            length = sum(terms.values())
+            self._doc_terms[project_id] = dict(terms)
+            self._doc_len[project_id] = length
+            self._doc_meta[project_id] = (year, project.get('Major'))
+            self._total_len += length
+
+    def remove(self, project_id):
+        with self._lock:
+            self._remove(int(project_id))
+
+    def _remove(self, project_id):
+        terms = self._doc_terms.pop(project_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(project_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(project_id)
+        self._doc_meta.pop(project_id, None)
+
+    def _matches(self, project_id, year_from, year_to, major):
+        year, doc_major = self._doc_meta[project_id]
+        if year_from is not None and (year is None or year < year_from):
+            return False
+        if year_to is not None and (year is None or year > year_to):
+            return False
+        if major and doc_major != major:
+            return False
+        return True
+
+    def search(self, query, year_from=None, year_to=None, major=None, limit=10, offset=0):
+        """Return (project_ids, total_matches) for one page of BM25-ranked results."""
+        terms = set(tokenize(query))
+        if not terms:
+            return [], 0
+
+        with self._lock:
+            n_docs = len(self._doc_len)
+            if not n_docs:
+                return [], 0
+            avg_len = self._total_len / n_docs
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for project_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[project_id] / avg_len)
+                    scores[project_id] = scores.get(project_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            if year_from is not None or year_to is not None or major:
+                scores = {pid: score for pid, score in scores.items()
+                          if self._matches(pid, year_from, year_to, major)}
+
+        # Highest score first; ties broken by newest project
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [project_id for project_id, _ in top[offset:]], len(scores)
+
+
+# Function to load every project's metadata into a fresh SearchIndex
+def build_index():
+    index = SearchIndex()
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT project_id, Title, Authors, Keywords, Abstract, Major, Publication_Year FROM project_details")
+        for project in cursor:
+            index.add(project)
+    return index
+
+
+_index = RefreshedIndex(build_index, lambda: Config.SEARCH_INDEX_REFRESH, name='search-index')
+
+
+# Function to get the process-wide index, building it on first use.
+# Every SEARCH_INDEX_REFRESH seconds it is rebuilt in the background to pick
+# up changes made by other worker processes.
+def get_index():
+    return _index.get()
+
+
+# Function to add or refresh one project in the index after it is saved or edited
+def index_project(project):
+    _index.apply(lambda index: index.add(project))
+
+
+# Function to drop a project from the index after it is deleted
+def unindex_project(project_id):
+    _index.apply(lambda index: index.remove(project_id))
+
+
+# Function to rank projects for a browse query; returns (project_ids, total_results)
+def search(query, year_from=None, year_to=None, major=None, results_per_page=10, page=1):
+    def to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    return get_index().search(
+        query,
+        year_from=to_int(year_from),
+        year_to=to_int(year_to),
+        major=major or None,
+        limit=results_per_page,
+        offset=(page - 1) * results_per_page,
+    )
@@ -0,0 +1,235 @@
+# session_store.py
+# Server-side sessions in a single SQLite file (WAL mode) with an in-process LRU.
+#
+# Replaces the per-file flask_session/ storage. Every session is one row keyed
+# by its id, with an expiry time and a version that is bumped on each write.
+# Workers keep recently used sessions unpickled in an LRU and only re-read the
+# payload when the stored version has moved on, so a request costs one indexed
+# lookup. Rows are only written when the session changes, or to push the
+# expiry forward once it is more than SESSION_REFRESH_AFTER seconds old.
+# A daemon thread deletes expired rows every SESSION_SWEEP_INTERVAL seconds.
+# It is started by the first request each process handles rather than at
+# import, since threads don't survive a fork (gunicorn --preload builds the
+# app once in the master and forks the workers from it).
+#
+# Sessions left in the old flask_session/ directory are imported the first
+# time their cookie is seen, then removed.
+import copy
+import hashlib
+import os
+import pickle
+import secrets
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class StoredSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, version=0, expires_at=0):
+        def on_update(session):
+            session.modified = True
+
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.version = version
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class SqliteSessionInterface(SessionInterface):
+    def __init__(self, path, ttl, lru_size=1024, sweep_interval=300, refresh_after=300, legacy_dir=None):
+        self.path = path
+        self.ttl = ttl
+        self.lru_size = lru_size
+        self.sweep_interval = sweep_interval
+        self.refresh_after = refresh_after
+        self.legacy_dir = legacy_dir
+        self._local = threading.local()
+        self._lru = OrderedDict()  # sid -> (version, expires_at, data)
+        self._lru_lock = threading.Lock()
+        self._sweeper_pid = None  # Process the sweeper thread was started in
+        self._sweeper_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Short-lived connection so nothing is shared with forked workers
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                sid TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                version INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
+        conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # LRU helpers
+
+    def _lru_get(self, sid):
+        with self._lru_lock:
+            entry = self._lru.get(sid)
+            if entry is not None:
+                self._lru.move_to_end(sid)
+            return entry
+
+    def _lru_put(self, sid, version, expires_at, data):
+        with self._lru_lock:
+            self._lru[sid] = (version, expires_at, data)
+            self._lru.move_to_end(sid)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _lru_drop(self, sid):
+        with self._lru_lock:
+            self._lru.pop(sid, None)
+
+    # Storage
+
+    def load(self, sid):
+        """Return (version, expires_at, data) for a live session, or None."""
+        now = time.time()
+        row = self._conn().execute("SELECT version, expires_at FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if row is None:
+            self._lru_drop(sid)
+            return self._import_legacy(sid)
+        version, expires_at = row
+        if expires_at <= now:
+            self.delete(sid)
+            return None
+
+        cached = self._lru_get(sid)
+        if cached is not None and cached[0] == version:
+            # Copy so in-place edits to nested values can't leak into the cache
+            return version, expires_at, copy.deepcopy(cached[2])
+
+        row = self._conn().execute("SELECT data FROM sessions WHERE sid = ? AND version = ?", (sid, version)).fetchone()
+        if row is None:
+            return None
+        data = pickle.loads(row[0])
+        self._lru_put(sid, version, expires_at, data)
+        return version, expires_at, copy.deepcopy(data)
+
+    def store(self, sid, data, version, expires_at):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, version, expires_at) VALUES (?, ?, ?, ?)",
+            (sid, pickle.dumps(data, pickle.HIGHEST_PROTOCOL), version, expires_at)
+        )
+        self._lru_put(sid, version, expires_at, copy.deepcopy(data))
+
+    def delete(self, sid):
+        self._conn().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        self._lru_drop(sid)
+
+    def sweep(self):
+        cursor = self._conn().execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def _start_sweeper(self):
+        """Start the sweeper thread once per process (again in each forked worker)."""
+        pid = os.getpid()
+        if self._sweeper_pid == pid:
+            return
+        with self._sweeper_lock:
+            if self._sweeper_pid != pid:
+                self._sweeper_pid = pid
+                sweeper = threading.Thread(target=self._sweep_forever, name='session-sweeper', daemon=True)
+                sweeper.start()
+
+    def _sweep_forever(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except sqlite3.Error as e:
+                print(f"Error sweeping expired sessions: {e}")
+
+    def _import_legacy(self, sid):
+        """Move a session out of the old flask_session/ directory, if it is there."""
+        if not self.legacy_dir:
+            return None
+        # Flask-Session's filesystem backend stores "session:<sid>" under md5(key)
+        path = os.path.join(self.legacy_dir, hashlib.md5(f"session:{sid}".encode('utf-8')).hexdigest())
+        try:
+            with open(path, 'rb') as f:
+                legacy_expiry = struct.unpack('I', f.read(4))[0]
+                data = pickle.load(f)
+        except (OSError, struct.error, pickle.UnpicklingError, EOFError):
+            return None
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        if (legacy_expiry and legacy_expiry <= time.time()) or not isinstance(data, dict):
+            return None
+        expires_at = time.time() + self.ttl
+        self.store(sid, data, 1, expires_at)
+        return 1, expires_at, copy.deepcopy(data)
+
+    # Flask SessionInterface
+
+    def open_session(self, app, request):
+        self._start_sweeper()
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            loaded = self.load(sid)
+            if loaded is not None:
+                version, expires_at, data = loaded
+                return StoredSession(data, sid=sid, version=version, expires_at=expires_at)
+        return StoredSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        refresh = now - (session.expires_at - self.ttl) > self.refresh_after
+        if session.modified or session.new or refresh:
+            expires_at = now + self.ttl
+            self.store(session.sid, dict(session), session.version + 1, expires_at)
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+# Function to install the SQLite session store on a Flask app
+def init_app(app):
+    app.session_interface = SqliteSessionInterface(
+        path=app.config['SESSION_SQLITE_PATH'],
+        ttl=app.permanent_session_lifetime.total_seconds(),
+        lru_size=app.config['SESSION_LRU_SIZE'],
+        sweep_interval=app.config['SESSION_SWEEP_INTERVAL'],
+        refresh_after=app.config['SESSION_REFRESH_AFTER'],
+        legacy_dir=app.config.get('SESSION_LEGACY_DIR'),
+    )
@@ -0,0 +1,156 @@
+# stats.py
+# Materialized counters for the admin dashboard.
+#
+# dashboard_stats holds a single row of totals and project_save_counts holds
+# one row per saved project. Both are adjusted in the same transaction as the
+# change that affects them, so the dashboard reads them in O(1) instead of
+# scanning users, project_details and user_library. reconcile() recomputes
+# everything from the base tables to correct any drift.
+#
+# Reconciling scans whole tables, so it never runs on the request path. A
+# daemon thread, started by the first dashboard load in each process, runs it
+# every STATS_RECONCILE_INTERVAL seconds, skipping the run when another worker
+# reconciled more recently (dashboard_stats.reconciled_at). With the interval
+# set to 0, run `python stats.py` from cron instead.
+import os
+import threading
+import time
+
+from config import Config
+from connect import database_connection
+
+_reconciler_pid = None  # Process the reconciler thread was started in
+_reconciler_lock = threading.Lock()
+
+
+# Function to apply deltas to the dashboard totals using the caller's cursor (and transaction)
+def adjust_totals(cursor, projects=0, users=0, active_users=0):
+    if not (projects or users or active_users):
+        return
+    cursor.execute("""
+        UPDATE dashboard_stats
+        SET project_count = GREATEST(project_count + %s, 0),
+            user_count = GREATEST(user_count + %s, 0),
+            active_user_count = GREATEST(active_user_count + %s, 0)
+        WHERE id = 1
+    """, (projects, users, active_users))
+
+
+# Function to apply a delta to one project's save count using the caller's cursor
+def adjust_save_count(cursor, project_id, delta):
+    cursor.execute("""
+        INSERT INTO project_save_counts (project_id, save_count) VALUES (%s, GREATEST(%s, 0))
+        ON DUPLICATE KEY UPDATE save_count = GREATEST(save_count + %s, 0)
+    """, (project_id, delta, delta))
+
+
+# Function to take the saved copies off every project in these users' libraries (before the users are deleted)
+def forget_user_saves(cursor, user_ids):
+    if not user_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(user_ids))
+    cursor.execute(f"""
+        UPDATE project_save_counts psc
+        JOIN (SELECT project_id, COUNT(*) AS saves FROM user_library WHERE user_id IN ({placeholders}) GROUP BY project_id) ul
+            ON ul.project_id = psc.project_id
+        SET psc.save_count = GREATEST(psc.save_count - ul.saves, 0)
+    """, list(user_ids))
+
+
+# Function to drop deleted projects' save counts
+def forget_projects(cursor, project_ids):
+    if not project_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    cursor.execute(f"DELETE FROM project_save_counts WHERE project_id IN ({placeholders})", list(project_ids))
+
+
+# Function to recompute every counter from the base tables
+def reconcile():
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO dashboard_stats (id, project_count, user_count, active_user_count, reconciled_at)
+            VALUES (1,
+                    (SELECT COUNT(*) FROM project_details),
+                    (SELECT COUNT(*) FROM users),
+                    (SELECT COUNT(*) FROM users WHERE status = 'active'),
+                    NOW())
+            ON DUPLICATE KEY UPDATE
+                project_count = VALUES(project_count),
+                user_count = VALUES(user_count),
+                active_user_count = VALUES(active_user_count),
+                reconciled_at = VALUES(reconciled_at)
+        """)
+        cursor.execute("DELETE FROM project_save_counts")
+        cursor.execute("""
+            INSERT INTO project_save_counts (project_id, save_count)
+            SELECT project_id, COUNT(*) FROM user_library GROUP BY project_id
+        """)
+        conn.commit()
+
+
+# Function to reconcile unless any worker has done so within STATS_RECONCILE_INTERVAL seconds
+def reconcile_if_stale():
+    with database_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT TIMESTAMPDIFF(SECOND, reconciled_at, NOW()) FROM dashboard_stats WHERE id = 1")
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] >= Config.STATS_RECONCILE_INTERVAL:
+        reconcile()
+        return True
+    return False
+
+
+def _reconcile_forever():
+    while True:
+        try:
+            reconcile_if_stale()
+        except Exception as e:
+            print(f"Error reconciling dashboard stats: {e}")
+        time.sleep(Config.STATS_RECONCILE_INTERVAL)
+
+
+# Function to start the background reconciler once per process (again in each forked worker)
+def start_reconciler():
+    global _reconciler_pid
+    pid = os.getpid()
+    if Config.STATS_RECONCILE_INTERVAL <= 0 or _reconciler_pid == pid:
+        return
+    with _reconciler_lock:
+        if _reconciler_pid != pid:
+            _reconciler_pid = pid
+            threading.Thread(target=_reconcile_forever, name='stats-reconcile', daemon=True).start()
+
+
+# Function to read the dashboard totals and the top-N most saved projects.
+# Only reads the materialized rows; reconciling happens on the background thread.
+def get_dashboard_stats(top_n=None):
+    start_reconciler()
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT project_count, user_count, active_user_count FROM dashboard_stats WHERE id = 1")
+        totals = cursor.fetchone() or {'project_count': 0, 'user_count': 0, 'active_user_count': 0}
+
+        cursor.execute('''
+            SELECT
+                project_details.project_id,
+                project_details.Title,
+                project_details.Authors,
+                project_details.Major,
+                project_details.Publication_Year,
+                project_save_counts.save_count
+            FROM project_save_counts
+            JOIN project_details ON project_save_counts.project_id = project_details.project_id
+            WHERE project_save_counts.save_count > 0
+            ORDER BY project_save_counts.save_count DESC
+            LIMIT %s
+        ''', (top_n or Config.DASHBOARD_TOP_N,))
+        totals['most_saved'] = cursor.fetchall()
+    return totals
+
+
+if __name__ == '__main__':
+    # Run from cron to reconcile on a schedule
+    reconcile()
+    print("Dashboard stats reconciled.")
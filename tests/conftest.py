@@ -0,0 +1,10 @@
+# tests/conftest.py
+# The app is a set of top-level modules rather than a package, so make them importable.
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the app opens the session store; keep it out of the working tree
+os.environ.setdefault('CAPSARC_SESSION_DB', os.path.join(tempfile.mkdtemp(), 'sessions.sqlite3'))
@@ -0,0 +1,75 @@
+# tests/sqlite_db.py
+# An in-memory SQLite database standing in for MySQL, so code that builds its
+# own SQL can be tested against real rows. Cursors accept the mysql.connector
+# calling style: %s placeholders, dictionary=True, and SELECT ... FOR UPDATE.
+import re
+import sqlite3
+from contextlib import contextmanager
+
+_FOR_UPDATE_RE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+
+
+class SqliteCursor:
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, statement, params=()):
+        statement = _FOR_UPDATE_RE.sub('', statement.strip()).replace('%s', '?')
+        self._cursor.execute(statement, tuple(params or ()))
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class SqliteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SqliteCursor(self._conn, dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+class SqliteDatabase:
+    def __init__(self, schema):
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._conn.executescript(schema)
+
+    def execute(self, statement, params=()):
+        rows = self._conn.execute(statement, params).fetchall()
+        self._conn.commit()
+        return rows
+
+    # Drop-in replacement for connect.database_connection
+    @contextmanager
+    def connection(self):
+        conn = SqliteConnection(self._conn)
+        try:
+            yield conn
+        finally:
+            self._conn.rollback()
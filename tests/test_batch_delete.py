@@ -0,0 +1,142 @@
+# tests/test_batch_delete.py
+# Batch project and user deletes in admin.py, against SQLite rows.
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('mysql.connector')
+
+import admin
+from config import Config
+from sqlite_db import SqliteDatabase
+
+SCHEMA = """
+CREATE TABLE project_details (project_id INTEGER PRIMARY KEY, Title TEXT, pdf_hash TEXT);
+CREATE TABLE users (user_id INTEGER PRIMARY KEY, status TEXT, profile_picture_url TEXT);
+CREATE TABLE user_library (user_id INTEGER, project_id INTEGER);
+CREATE TABLE pdf_pages (pdf_hash TEXT, page_number INTEGER);
+"""
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = SqliteDatabase(SCHEMA)
+    for project_id, pdf_hash in ((1, 'aaa'), (2, 'bbb'), (3, 'bbb'), (4, None), (5, 'ccc')):
+        db.execute("INSERT INTO project_details (project_id, Title, pdf_hash) VALUES (?, ?, ?)",
+                   (project_id, f"Project {project_id}", pdf_hash))
+    for pdf_hash in ('aaa', 'bbb', 'ccc'):
+        db.execute("INSERT INTO pdf_pages (pdf_hash, page_number) VALUES (?, 1)", (pdf_hash,))
+    for user_id, status in ((10, 'active'), (11, 'inactive'), (12, 'active')):
+        db.execute("INSERT INTO users (user_id, status, profile_picture_url) VALUES (?, ?, ?)",
+                   (user_id, status, f"static/uploads/user_{user_id}.png"))
+    for user_id, project_id in ((10, 1), (10, 2), (11, 1), (12, 5)):
+        db.execute("INSERT INTO user_library (user_id, project_id) VALUES (?, ?)", (user_id, project_id))
+
+    monkeypatch.setattr(admin, 'database_connection', db.connection)
+    monkeypatch.setattr(Config, 'ADMIN_DELETE_CHUNK_SIZE', 2)  # Exercise several chunks per request
+    return db
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {}
+
+    def record(name):
+        def call(*args, **kwargs):
+            args = [arg for arg in args if not hasattr(arg, 'execute')]  # Drop the cursor
+            calls.setdefault(name, []).append((*args, kwargs) if kwargs else tuple(args))
+        return call
+
+    for module, name in ((admin.dashboard_stats, 'forget_projects'), (admin.dashboard_stats, 'forget_user_saves'),
+                         (admin.dashboard_stats, 'adjust_totals'), (admin.duplicates, 'forget_projects'),
+                         (admin.page_cache, 'bump_generation'), (admin.page_cache, 'generation_committed'),
+                         (admin.search_index, 'unindex_project'), (admin.catalog, 'unindex_project'),
+                         (admin.typeahead, 'unindex_project'), (admin.presence, 'forget_users')):
+        monkeypatch.setattr(module, name, record(f'{module.__name__}.{name}'))
+    monkeypatch.setattr(admin, '_remove_pdf_files', record('remove_pdf_files'))
+    monkeypatch.setattr(admin, '_remove_profile_picture', record('remove_profile_picture'))
+    return calls
+
+
+def column(db, statement):
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(statement)
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def test_delete_projects_reports_each_id(db, calls):
+    assert admin.delete_projects_by_id([2, 99, 1, 4]) == {2: 'deleted', 99: 'not_found', 1: 'deleted', 4: 'deleted'}
+    assert column(db, "SELECT project_id FROM project_details") == [3, 5]
+    assert column(db, "SELECT project_id FROM user_library") == [5]
+    assert calls['stats.adjust_totals'] == [({'projects': -3},)]
+    assert sorted(calls['search_index.unindex_project']) == [(1,), (2,), (4,)]
+    assert len(calls['page_cache.bump_generation']) == len(calls['page_cache.generation_committed']) == 1
+
+
+def test_delete_projects_keeps_shared_pdfs(db, calls):
+    admin.delete_projects_by_id([1, 2])
+    # Project 3 still points at 'bbb', so only 'aaa' is unreferenced
+    assert column(db, "SELECT pdf_hash FROM pdf_pages") == ['bbb', 'ccc']
+    assert calls['remove_pdf_files'] == [({'aaa'},)]
+
+    admin.delete_projects_by_id([3])
+    assert column(db, "SELECT pdf_hash FROM pdf_pages") == ['ccc']
+    assert calls['remove_pdf_files'][-1] == ({'bbb'},)
+
+
+def test_delete_unknown_projects_changes_nothing(db, calls):
+    assert admin.delete_projects_by_id([98, 99]) == {98: 'not_found', 99: 'not_found'}
+    assert column(db, "SELECT project_id FROM project_details") == [1, 2, 3, 4, 5]
+    assert 'stats.adjust_totals' not in calls and 'page_cache.bump_generation' not in calls
+
+
+def test_failed_project_delete_rolls_back(db, calls, monkeypatch):
+    def fail(cursor, project_ids):
+        raise RuntimeError('deadlock')
+
+    monkeypatch.setattr(admin.duplicates, 'forget_projects', fail)
+    with pytest.raises(RuntimeError):
+        admin.delete_projects_by_id([1, 2, 3])
+    assert column(db, "SELECT project_id FROM project_details") == [1, 2, 3, 4, 5]
+    assert column(db, "SELECT project_id FROM user_library") == [1, 1, 2, 5]
+    assert 'search_index.unindex_project' not in calls and 'remove_pdf_files' not in calls
+
+
+def test_delete_users_reports_each_id(db, calls):
+    assert admin.delete_users_by_id([10, 11, 50]) == {10: 'deleted', 11: 'deleted', 50: 'not_found'}
+    assert column(db, "SELECT user_id FROM users") == [12]
+    assert column(db, "SELECT user_id FROM user_library") == [12]
+    assert calls['stats.adjust_totals'] == [({'users': -2, 'active_users': -1},)]
+    assert calls['presence.forget_users'] == [([10, 11],)]
+    assert sorted(calls['remove_profile_picture']) == [('static/uploads/user_10.png',), ('static/uploads/user_11.png',)]
+
+
+@pytest.fixture
+def client(db, calls):
+    import app as app_module
+
+    return app_module.app.test_client()
+
+
+def test_batch_route_lists_invalid_and_missing_ids(client, db):
+    response = client.post('/admin/delete_projects', json={'project_ids': [5, 'x', 5, 42]})
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'status': 'success', 'deleted': 1,
+        'results': [{'id': 'x', 'status': 'invalid'}, {'id': 5, 'status': 'deleted'}, {'id': 42, 'status': 'not_found'}],
+    }
+    assert column(db, "SELECT project_id FROM project_details") == [1, 2, 3, 4]
+
+
+def test_batch_route_accepts_comma_separated_form_fields(client, db):
+    response = client.post('/admin/delete_users', data={'user_ids': ['10,11', '12']})
+    assert response.get_json()['deleted'] == 3
+    assert column(db, "SELECT user_id FROM users") == []
+
+
+def test_batch_route_rejects_empty_and_oversized_requests(client, monkeypatch):
+    assert client.post('/admin/delete_users', json={}).status_code == 400
+    monkeypatch.setattr(Config, 'ADMIN_DELETE_MAX_IDS', 2)
+    response = client.post('/admin/delete_projects', json={'project_ids': [1, 2, 3]})
+    assert response.status_code == 400
+    assert 'At most 2' in response.get_json()['message']
@@ -0,0 +1,86 @@
+# tests/test_catalog.py
+# Year/major masks, facet counts and paging in catalog.py.
+import pytest
+
+pytest.importorskip('mysql.connector')
+pytest.importorskip('numpy')
+
+import catalog
+
+
+def project(project_id, year=2023, major='BSIT'):
+    return {'project_id': project_id, 'Publication_Year': year, 'Major': major}
+
+
+@pytest.fixture
+def projects():
+    assert catalog._load_numpy()
+    projects = catalog.Catalog(capacity=2)  # Small enough to exercise _grow()
+    projects.add(project(1, year=2021))
+    projects.add(project(2, year=2022, major='BSCS'))
+    projects.add(project(3, year=2023))
+    projects.add(project(4, year=None, major='BSCS'))
+    projects.add(project(5, year=2023, major='bsit '))
+    return projects
+
+
+def test_unfiltered_browse_lists_newest_first(projects):
+    project_ids, total, _ = projects.browse()
+    assert (project_ids, total) == ([5, 4, 3, 2, 1], 5)
+
+
+def test_year_range_mask(projects):
+    project_ids, total, _ = projects.browse(year_from=2022, year_to='2023')
+    assert (project_ids, total) == ([5, 3, 2], 3)
+
+
+def test_major_filter_ignores_case_and_whitespace(projects):
+    for major in ('BSIT', 'bsit', ' BsIt '):
+        project_ids, total, _ = projects.browse(major=major)
+        assert (project_ids, total) == ([5, 3, 1], 3)
+
+
+def test_unknown_major_matches_nothing(projects):
+    assert projects.browse(major='BSEE')[:2] == ([], 0)
+
+
+def test_facets_count_every_filter_but_their_own(projects):
+    _, _, facets = projects.browse(year_from=2022, major='BSCS')
+    # Majors are counted within the year range, years within the major
+    assert facets['majors'] == [('BSIT', 2), ('BSCS', 1)]
+    assert facets['years'] == [(2022, 1)]
+
+
+def test_year_facets_skip_missing_years(projects):
+    _, _, facets = projects.browse()
+    assert facets['years'] == [(2023, 2), (2022, 1), (2021, 1)]
+    assert facets['majors'] == [('BSIT', 3), ('BSCS', 2)]
+
+
+def test_offset_and_keyset_pages_agree(projects):
+    assert projects.browse(limit=2, offset=2)[:2] == ([3, 2], 5)
+    assert projects.browse(limit=2, after=4)[:2] == ([3, 2], 5)
+    assert projects.browse(limit=2, offset=4)[0] == [1]
+    assert projects.browse(limit=2, offset=6)[0] == []
+
+
+def test_edits_and_removals_update_rows(projects):
+    projects.add(project(2, year=2020, major='BSIT'))
+    projects.remove(5)
+    projects.remove(99)
+    project_ids, total, facets = projects.browse(major='bsit')
+    assert (project_ids, total) == ([3, 2, 1], 3)
+    assert facets['majors'] == [('BSIT', 3), ('BSCS', 1)]
+
+
+def test_out_of_order_inserts_are_sorted(projects):
+    projects.add(project(0, year=2019))
+    assert projects.browse()[0] == [5, 4, 3, 2, 1, 0]
+
+
+def test_failed_build_falls_back_to_sql(monkeypatch):
+    def build():
+        raise RuntimeError('database is down')
+
+    monkeypatch.setattr(catalog, '_catalog', catalog.RefreshedIndex(build, lambda: 60, name='catalog'))
+    assert catalog.get_catalog() is None
@@ -0,0 +1,103 @@
+# tests/test_imrad.py
+# Chunk splitting and chunked summarizing in imrad.py, with a fake model client.
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import imrad
+from config import Config
+
+
+class FakeModelClient:
+    """Answers each prompt with a numbered summary and keeps the prompts it was sent."""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        part = prompt.split("part ", 1)[1].split(" ", 1)[0] if prompt.startswith("This is part") else "final"
+        return f"summary {part}"
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(imrad, '_cache_get', cache.get)
+    monkeypatch.setattr(imrad, '_cache_put', cache.__setitem__)
+    return cache
+
+
+def test_split_keeps_all_text_within_size():
+    text = "".join(f"Paragraph {i} " + "word " * 30 + "\n\n" for i in range(20))
+    chunks = imrad._split(text, 200)
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 200 for chunk in chunks)
+
+
+def test_split_prefers_paragraph_breaks():
+    text = "a" * 60 + "\n\n" + "b" * 30 + "\n" + "c" * 30
+    assert imrad._split(text, 100) == ["a" * 60 + "\n\n", "b" * 30 + "\n" + "c" * 30]
+
+
+def test_split_falls_back_to_hard_cuts():
+    assert imrad._split("x" * 250, 100) == ["x" * 100, "x" * 100, "x" * 50]
+
+
+def test_split_short_and_empty_text():
+    assert imrad._split("short", 100) == ["short"]
+    assert imrad._split("", 100) == []
+
+
+def test_summarize_chunks_keeps_chunk_order(monkeypatch, no_cache):
+    monkeypatch.setattr(Config, 'IMRAD_CHUNK_CHARS', 50)
+    client = FakeModelClient()
+    text = " ".join(f"sentence{i}" for i in range(40))
+
+    summary = imrad._summarize_chunks(client, text)
+
+    parts = len(imrad._split(text, 50))
+    assert parts > 1
+    assert summary == "\n\n".join(f"summary {part}" for part in range(1, parts + 1))
+    assert sorted(client.prompts) == sorted(
+        f"{imrad.CHUNK_PROMPT.format(part=part, parts=parts)}: {chunk}"
+        for part, chunk in enumerate(imrad._split(text, 50), start=1)
+    )
+
+
+def test_summarize_chunks_reuses_cached_chunks(monkeypatch, no_cache):
+    monkeypatch.setattr(Config, 'IMRAD_CHUNK_CHARS', 50)
+    text = " ".join(f"sentence{i}" for i in range(40))
+    imrad._summarize_chunks(FakeModelClient(), text)
+
+    client = FakeModelClient()
+    imrad._summarize_chunks(client, text)
+    assert client.prompts == []
+
+
+def test_chunk_cache_is_keyed_by_position(monkeypatch, no_cache):
+    monkeypatch.setattr(Config, 'IMRAD_CHUNK_CHARS', 50)
+    chunk = "x" * 50
+    imrad._summarize_chunks(FakeModelClient(), chunk * 2)
+
+    # The same text as part 1 of 3 was produced from a different prompt, so it is not reused
+    client = FakeModelClient()
+    assert imrad._summarize_chunks(client, chunk * 3) == "summary 1\n\nsummary 2\n\nsummary 3"
+    assert len(client.prompts) == 3
+
+
+def test_generate_imrad_condenses_long_text(monkeypatch, no_cache):
+    monkeypatch.setattr(Config, 'IMRAD_CHUNK_CHARS', 50)
+    client = FakeModelClient()
+    monkeypatch.setattr(imrad, '_model_client', client)
+
+    assert imrad.generate_imrad(" ".join(f"sentence{i}" for i in range(40))) == "summary final"
+    final_prompt = client.prompts[-1]
+    assert final_prompt.startswith(imrad.IMRAD_PROMPT)
+    assert len(final_prompt) <= len(imrad.IMRAD_PROMPT) + 2 + 50
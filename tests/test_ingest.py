@@ -0,0 +1,75 @@
+# tests/test_ingest.py
+# Duplicate handling when ingest.py stores a manifest's PDFs.
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import duplicates
+import ingest
+import pdf_store
+from config import Config
+from sqlite_db import SqliteDatabase
+
+SCHEMA = """
+CREATE TABLE project_details (
+    project_id INTEGER PRIMARY KEY, Title TEXT, pdf_hash TEXT, metadata_fingerprint TEXT
+);
+"""
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'PDF_STORE_FOLDER', str(tmp_path / 'store'))
+    db = SqliteDatabase(SCHEMA)
+    monkeypatch.setattr(ingest, 'database_connection', db.connection)
+    return db
+
+
+def write_pdf(pdf_dir, name, content):
+    pdf_dir.mkdir(exist_ok=True)
+    (pdf_dir / name).write_bytes(content)
+
+
+def entry(file, title, authors='Ana Reyes', year='2023'):
+    return {'file': file, 'title': title, 'authors': authors, 'major': 'BSIT', 'year': year, 'keywords': '', 'abstract': ''}
+
+
+def test_store_files_skips_and_rejects_duplicates(db, tmp_path):
+    pdf_dir = tmp_path / 'pdfs'
+    for name in ('imported.pdf', 'existing_meta.pdf', 'new.pdf', 'new_again.pdf', 'copy.pdf'):
+        write_pdf(pdf_dir, name, name.encode() * 10)
+    write_pdf(pdf_dir, 'same_bytes.pdf', b'new.pdf' * 10)
+
+    imported_hash = pdf_store.store_pdf(b'imported.pdf' * 10)
+    db.execute("INSERT INTO project_details VALUES (1, 'Imported Earlier', ?, ?)",
+               (imported_hash, duplicates.metadata_fingerprint('Imported Earlier', 'Ana Reyes', '2023')))
+    db.execute("INSERT INTO project_details VALUES (2, 'Parking System', 'other', ?)",
+               (duplicates.metadata_fingerprint('Parking System', 'Ana Reyes', '2023'),))
+
+    entries = [
+        entry('imported.pdf', 'Imported Earlier'),
+        entry('existing_meta.pdf', 'parking  system'),
+        entry('new.pdf', 'Canteen Ordering'),
+        entry('same_bytes.pdf', 'Another Title'),
+        entry('new_again.pdf', 'Canteen Ordering!'),
+        entry('copy.pdf', 'Grade Monitor', authors='Ana Reyes and Ben Santos'),
+        entry('missing.pdf', 'Missing'),
+    ]
+    failures = []
+    new, skipped = ingest._store_files(entries, str(pdf_dir), failures)
+
+    assert skipped == 1
+    assert sorted(entry['file'] for entry in new.values()) == ['copy.pdf', 'new.pdf']
+    reasons = dict(failures)
+    assert reasons['existing_meta.pdf'] == "Project already exists (same title, authors and year: Parking System)."
+    assert reasons['same_bytes.pdf'] == "Same PDF as new.pdf."
+    assert reasons['new_again.pdf'] == "Same title, authors and year as new.pdf."
+    assert reasons['missing.pdf'].startswith("Could not read PDF")
+
+    # Rejected PDFs are not left in the store; imported and new ones are
+    assert pdf_store.pdf_path(imported_hash) is not None
+    for pdf_hash, new_entry in new.items():
+        assert pdf_store.pdf_path(pdf_hash) is not None
+        assert new_entry['fingerprint'] == duplicates.metadata_fingerprint(new_entry['title'], new_entry['authors'], new_entry['year'])
+    stored = {p.name for p in (tmp_path / 'store').rglob('*.pdf')}
+    assert len(stored) == 3
@@ -0,0 +1,155 @@
+# tests/test_jobs.py
+# IMRaD job pipeline: claiming, retries and backoff, run against an in-memory
+# project_details row and the stub model client.
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import imrad
+import jobs
+from config import Config
+
+
+class FakeProjectDetails:
+    """The project_details and imrad_cache columns the pipeline reads and writes."""
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.status = jobs.STATUS_PENDING
+        self.attempts = 0
+        self.error = None
+        self.retry_after = None  # Seconds from NOW() stored in imrad_next_attempt_at
+        self.generated_imrad = None
+        self.cache = {}
+
+
+class FakeCursor:
+    def __init__(self, table):
+        self.table = table
+        self.rowcount = 0
+        self._row = None
+
+    def execute(self, statement, params=()):
+        row = self.table
+        if 'imrad_attempts = imrad_attempts + 1' in statement:
+            status, project_id, expected = params
+            self.rowcount = 0
+            if project_id == row.project_id and row.status == expected:
+                row.status = status
+                row.attempts += 1
+                self.rowcount = 1
+        elif statement.startswith('SELECT imrad_attempts'):
+            self._row = (row.attempts,)
+        elif 'imrad_next_attempt_at = IF' in statement:
+            row.status, row.error, row.retry_after, _, _ = params
+        elif 'SET generated_imrad' in statement:
+            row.generated_imrad = params[0]
+        elif 'FROM imrad_cache' in statement:
+            output = row.cache.get(params[0])
+            self._row = (output,) if output is not None else None
+        elif statement.startswith('REPLACE INTO imrad_cache'):
+            row.cache[params[0]] = params[1]
+        else:
+            raise AssertionError(f"Unexpected statement: {statement}")
+
+    def fetchone(self):
+        return self._row
+
+
+class FakeConnection:
+    def __init__(self, table):
+        self.table = table
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self.table)
+
+    def commit(self):
+        pass
+
+
+class FailingModelClient:
+    name = 'failing'
+
+    def generate(self, prompt):
+        raise RuntimeError("model unavailable")
+
+
+@pytest.fixture
+def project(monkeypatch):
+    table = FakeProjectDetails(project_id=7)
+
+    @contextmanager
+    def fake_database_connection():
+        yield FakeConnection(table)
+
+    monkeypatch.setattr(jobs, 'database_connection', fake_database_connection)
+    monkeypatch.setattr(imrad, 'database_connection', fake_database_connection)
+    monkeypatch.setattr(jobs.pdf_store, 'get_project_pdf_file', lambda project_id: ('project.pdf', 'abc123'))
+    monkeypatch.setattr(jobs.extraction, 'get_text', lambda path, pdf_hash: "A study of campus parking.\nIt found too few spaces.")
+    monkeypatch.setattr(jobs.duplicates, 'record_signature', lambda project_id, text: None)
+    monkeypatch.setattr(Config, 'IMRAD_MAX_ATTEMPTS', 3)
+    monkeypatch.setattr(Config, 'IMRAD_RETRY_BACKOFF', 30)
+    monkeypatch.setattr(imrad, '_model_client', imrad.StubModelClient())
+    return table
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(jobs, 'enqueue_imrad', lambda project_id, delay=0: calls.append((project_id, delay)))
+    return calls
+
+
+def test_claim_succeeds_once(project):
+    assert jobs._claim(7) == 1
+    assert project.status == jobs.STATUS_PROCESSING
+    assert jobs._claim(7) is None
+    assert project.attempts == 1
+
+
+def test_run_saves_summary_with_stub_client(project, enqueued):
+    jobs._run(7)
+
+    assert project.status == jobs.STATUS_DONE
+    assert project.attempts == 1
+    assert project.retry_after is None
+    assert project.generated_imrad.startswith("[stub paragraph 1]")
+    assert "<br><br>[stub paragraph 4]" in project.generated_imrad
+    assert enqueued == []
+
+
+def test_run_skips_job_claimed_elsewhere(project, enqueued):
+    project.status = jobs.STATUS_PROCESSING
+    jobs._run(7)
+    assert project.attempts == 0
+    assert project.generated_imrad is None
+
+
+def test_failures_retry_with_exponential_backoff(project, enqueued, monkeypatch):
+    monkeypatch.setattr(imrad, '_model_client', FailingModelClient())
+
+    jobs._run(7)
+    assert (project.status, project.attempts, project.retry_after) == (jobs.STATUS_PENDING, 1, 30)
+    assert project.error == "model unavailable"
+    assert enqueued == [(7, 30)]
+
+    jobs._run(7)
+    assert (project.status, project.attempts, project.retry_after) == (jobs.STATUS_PENDING, 2, 60)
+    assert enqueued == [(7, 30), (7, 60)]
+
+    # The last attempt marks the job failed and stops retrying
+    jobs._run(7)
+    assert (project.status, project.attempts, project.retry_after) == (jobs.STATUS_FAILED, 3, None)
+    assert enqueued == [(7, 30), (7, 60)]
+
+
+def test_retry_after_failure_can_succeed(project, enqueued, monkeypatch):
+    monkeypatch.setattr(imrad, '_model_client', FailingModelClient())
+    jobs._run(7)
+    monkeypatch.setattr(imrad, '_model_client', imrad.StubModelClient())
+    jobs._run(7)
+
+    assert (project.status, project.attempts, project.retry_after) == (jobs.STATUS_DONE, 2, None)
+    assert project.error is None
@@ -0,0 +1,105 @@
+# tests/test_page_cache.py
+# Cache keys, ETags and conditional GETs from page_cache.cached_page().
+import hashlib
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('mysql.connector')
+
+from flask import Flask, request, session
+
+import page_cache
+
+
+@pytest.fixture
+def generation(monkeypatch):
+    current = {'value': (1, datetime(2024, 5, 1, 12, 0, 0))}
+    monkeypatch.setattr(page_cache, 'get_generation', lambda: current['value'])
+    monkeypatch.setattr(page_cache, '_pages', page_cache.OrderedDict())
+    return current
+
+
+@pytest.fixture
+def app(generation):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.renders = 0
+
+    @page_cache.cached_page
+    def listing():
+        app.renders += 1
+        return f"page {request.args.get('page', '1')} q={request.args.get('q', '')}"
+
+    def login():
+        session['username'] = 'reader'
+        return "ok"
+
+    app.add_url_rule('/listing', endpoint='listing', view_func=listing)
+    app.add_url_rule('/login', endpoint='login', view_func=login)
+    return app
+
+
+def test_repeat_requests_are_served_from_cache(app):
+    client = app.test_client()
+    first = client.get('/listing')
+    second = client.get('/listing')
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data == b"page 1 q="
+    assert app.renders == 1
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.headers['Last-Modified'] == 'Wed, 01 May 2024 12:00:00 GMT'
+    assert 'private' in first.headers['Cache-Control']
+    assert 'Cookie' in first.headers['Vary']
+
+
+def test_etag_is_hash_of_body(app):
+    response = app.test_client().get('/listing')
+    assert response.headers['ETag'] == f'"{hashlib.md5(b"page 1 q=").hexdigest()}"'
+
+
+def test_matching_etag_gets_304(app):
+    client = app.test_client()
+    etag = client.get('/listing').headers['ETag']
+
+    response = client.get('/listing', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    response = client.get('/listing', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+
+
+def test_key_ignores_blank_args_and_arg_order(app):
+    client = app.test_client()
+    client.get('/listing?page=2&q=x')
+    client.get('/listing?q=x&page=2')
+    client.get('/listing?q=x&page=2&sort=')
+    assert app.renders == 1
+
+    client.get('/listing?page=3&q=x')
+    assert app.renders == 2
+
+
+def test_new_generation_renders_again(app, generation):
+    client = app.test_client()
+    first = client.get('/listing')
+    generation['value'] = (2, datetime(2024, 5, 2, 8, 30, 0))
+    second = client.get('/listing')
+
+    assert app.renders == 2
+    assert second.headers['Last-Modified'] == 'Thu, 02 May 2024 08:30:00 GMT'
+    # Same body, so browsers holding the old copy can still revalidate it
+    assert first.headers['ETag'] == second.headers['ETag']
+
+
+def test_logged_in_users_bypass_cache(app):
+    client = app.test_client()
+    client.get('/login')
+    response = client.get('/listing')
+    client.get('/listing')
+
+    assert app.renders == 2
+    assert 'ETag' not in response.headers
@@ -0,0 +1,110 @@
+# tests/test_pagination.py
+# Page-number and keyset paging for home and browse, against SQLite rows.
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('mysql.connector')
+
+import page_cache
+import user
+from sqlite_db import SqliteDatabase
+
+SCHEMA = """
+CREATE TABLE project_details (
+    project_id INTEGER PRIMARY KEY,
+    Title TEXT, Authors TEXT, Publication_Year INTEGER, Major TEXT,
+    Keywords TEXT, Abstract TEXT, generated_imrad TEXT, imrad_status TEXT
+);
+"""
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = SqliteDatabase(SCHEMA)
+    for project_id in range(1, 26):
+        db.execute(
+            "INSERT INTO project_details (project_id, Title, Publication_Year, Major) VALUES (?, ?, ?, ?)",
+            (project_id, f"Project {project_id}", 2023 if project_id % 5 else 2022, 'BSIT' if project_id % 2 else 'BSCS')
+        )
+    monkeypatch.setattr(user, 'database_connection', db.connection)
+    return db
+
+
+def ids(projects):
+    return [project['project_id'] for project in projects]
+
+
+def test_keyset_pages_match_offset_pages(db):
+    with db.connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        first, total = user.fetch_project_page(cursor, "Publication_Year = %s", [2023], results_per_page=5)
+        by_offset, _ = user.fetch_project_page(cursor, "Publication_Year = %s", [2023], results_per_page=5, page=2)
+        by_keyset, keyset_total = user.fetch_project_page(
+            cursor, "Publication_Year = %s", [2023], results_per_page=5, after=user.next_page_cursor(first, 5)
+        )
+
+    assert total == keyset_total == 20
+    assert ids(first) == [24, 23, 22, 21, 19]
+    assert ids(by_keyset) == ids(by_offset) == [18, 17, 16, 14, 13]
+
+
+def test_keyset_walk_covers_every_row_once(db):
+    seen = []
+    after = None
+    with db.connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        while True:
+            projects, _ = user.fetch_project_page(cursor, "1=1", [], results_per_page=7, after=after)
+            seen.extend(ids(projects))
+            after = user.next_page_cursor(projects, 7)
+            if after is None:
+                break
+    assert seen == list(range(25, 0, -1))
+
+
+def test_page_size_is_capped(db):
+    with db.connection() as conn:
+        projects, _ = user.fetch_project_page(conn.cursor(dictionary=True), "1=1", [], results_per_page=10_000)
+    assert len(projects) == 25 <= user.MAX_RESULTS_PER_PAGE
+
+
+def test_next_page_cursor_stops_on_short_page():
+    assert user.next_page_cursor([{'project_id': 9}, {'project_id': 4}], 2) == 4
+    assert user.next_page_cursor([{'project_id': 9}], 2) is None
+    assert user.next_page_cursor([], 2) is None
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(page_cache, 'get_generation', lambda: (0, None))
+    monkeypatch.setattr(page_cache, '_pages', page_cache.OrderedDict())
+    monkeypatch.setattr(user.catalog, 'get_catalog', lambda: None)
+    return app_module.app.test_client()
+
+
+def test_browse_next_link_follows_keyset(client):
+    response = client.get('/browse?Major=BSIT&results_per_page=5&after=100')
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert 'Project 25' in html and 'Project 17' in html and 'Project 15' not in html
+    assert 'after=17' in html
+
+
+def test_browse_query_pages_by_number(client, monkeypatch):
+    calls = []
+
+    def fake_search(query, year_from=None, year_to=None, major=None, results_per_page=10, page=1):
+        calls.append(page)
+        return [25, 24, 23, 22, 21], 12
+
+    monkeypatch.setattr(user.search_index, 'search', fake_search)
+    response = client.get('/browse?query=parking&results_per_page=5&after=21')
+    html = response.get_data(as_text=True)
+
+    assert calls == [1]
+    assert 'Next &raquo;' not in html
+    # Page links keep the query so page 2 is page 2 of the same search
+    assert '/browse?query=parking&amp;results_per_page=5&amp;page=2' in html
+    assert '/browse?query=parking&amp;results_per_page=5&amp;page=3' in html
@@ -0,0 +1,42 @@
+# tests/test_presence.py
+# Which sessions record_presence() reports to presence.py.
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('mysql.connector')
+
+from flask import Flask, session
+
+import admin
+
+
+@pytest.fixture
+def heartbeats(monkeypatch):
+    seen = []
+    # presence.heartbeat() ignores None, so only record real user IDs
+    monkeypatch.setattr(admin.presence, 'heartbeat', lambda user_id: user_id is not None and seen.append(user_id))
+    return seen
+
+
+def run_with_session(values):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    with app.test_request_context('/home'):
+        session.update(values)
+        admin.record_presence()
+
+
+def test_student_sessions_heartbeat(heartbeats):
+    run_with_session({'username': 'student', 'user_id': 7, 'presence_user_id': 7, 'user_context': {'user_id': 7}})
+    assert heartbeats == [7]
+
+
+def test_admin_sessions_do_not_mark_a_student_active(heartbeats):
+    # An admin who browsed /home has a user_context too, and user_id holds their admin_id
+    run_with_session({'username': 'admin', 'user_id': 7, 'user_context': {'user_id': None}})
+    assert heartbeats == []
+
+
+def test_anonymous_sessions(heartbeats):
+    run_with_session({})
+    assert heartbeats == []
@@ -0,0 +1,127 @@
+# tests/test_query_tracking.py
+# Query fingerprints, N+1 detection and query_budget() from connect.py.
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import connect
+from config import Config
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+
+    def executemany(self, statement, rows):
+        self.statements.append((statement, rows))
+
+    def close(self):
+        pass
+
+
+class FakeRawConnection:
+    def cursor(self, *args, **kwargs):
+        return FakeCursor()
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1):
+        pass
+
+
+class FakePool(connect.ConnectionPool):
+    def _open(self):
+        return FakeRawConnection()
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    # Keep the slow-query logger (and its EXPLAIN connection) out of these tests
+    monkeypatch.setattr(Config, 'SLOW_QUERY_THRESHOLD_MS', 10_000)
+    monkeypatch.setattr(Config, 'N_PLUS_ONE_THRESHOLD', 3)
+    monkeypatch.setattr(Config, 'MAX_CONNECTIONS_PER_REQUEST', 2)
+
+
+def test_fingerprint_replaces_literals():
+    assert connect.fingerprint("SELECT * FROM users WHERE id = 42 AND name = 'O\\'Brien'") == \
+        "SELECT * FROM users WHERE id = ? AND name = ?"
+
+
+def test_fingerprint_collapses_in_lists_and_whitespace():
+    first = connect.fingerprint("SELECT *\n  FROM t WHERE id IN (%s, %s) LIMIT 10")
+    second = connect.fingerprint(b"SELECT * FROM t WHERE id IN (%s,%s,%s) LIMIT 20")
+    assert first == second == "SELECT * FROM t WHERE id IN (...) LIMIT ?"
+
+
+def test_repeated_statement_is_flagged():
+    tracker = connect.QueryTracker()
+    for project_id in range(3):
+        tracker.record("SELECT * FROM project_details WHERE project_id = %s", (project_id,), 0.001)
+    tracker.record("SELECT COUNT(*) FROM users", None, 0.001)
+
+    assert tracker.count == 4
+    assert tracker.problems() == ["ran 3 times: SELECT * FROM project_details WHERE project_id = %s"]
+
+
+def test_distinct_statements_are_not_flagged():
+    tracker = connect.QueryTracker()
+    tracker.record("SELECT 1", None, 0.001)
+    tracker.record("SELECT * FROM users", None, 0.001)
+    assert tracker.problems() == []
+
+
+def test_too_many_connections_are_flagged():
+    pool = FakePool(size=5, timeout=1, leak_timeout=30, recycle=300)
+    token = connect.start_query_tracking()
+    try:
+        for _ in range(3):
+            with pool.connection():
+                pass
+    finally:
+        tracker = connect.stop_query_tracking(token)
+    assert tracker.connections == 3
+    assert tracker.problems() == ["opened 3 database connections"]
+
+
+def test_query_budget_allows_queries_within_budget():
+    pool = FakePool(size=5, timeout=1, leak_timeout=30, recycle=300)
+    with connect.query_budget(2, max_connections=1) as tracker:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.execute("SELECT 2")
+    assert tracker.count == 2
+    assert tracker.connections == 1
+
+
+def test_query_budget_fails_over_budget():
+    pool = FakePool(size=5, timeout=1, leak_timeout=30, recycle=300)
+    with pytest.raises(connect.QueryBudgetExceeded, match="3 queries run, budget is 2"):
+        with connect.query_budget(2):
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                for project_id in range(3):
+                    cursor.execute("SELECT * FROM project_details WHERE project_id = %s", (project_id,))
+
+
+def test_query_budget_fails_over_connection_budget():
+    pool = FakePool(size=5, timeout=1, leak_timeout=30, recycle=300)
+    with pytest.raises(connect.QueryBudgetExceeded, match="2 connections opened, budget is 1"):
+        with connect.query_budget(10, max_connections=1):
+            with pool.connection():
+                pass
+            with pool.connection():
+                pass
+
+
+def test_queries_outside_tracking_are_not_counted():
+    pool = FakePool(size=5, timeout=1, leak_timeout=30, recycle=300)
+    with pool.connection() as conn:
+        conn.cursor().execute("SELECT 1")
+    with connect.query_budget(0) as tracker:
+        pass
+    assert tracker.count == 0
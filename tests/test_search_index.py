@@ -0,0 +1,134 @@
+# tests/test_search_index.py
+# BM25 ranking in search_index.py and the background rebuild in refreshed_index.py.
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import search_index
+from refreshed_index import RefreshedIndex
+
+
+def project(project_id, title='', abstract='', keywords='', year=2023, major='BSIT'):
+    return {
+        'project_id': project_id, 'Title': title, 'Abstract': abstract, 'Keywords': keywords,
+        'Authors': '', 'Publication_Year': year, 'Major': major,
+    }
+
+
+@pytest.fixture
+def index():
+    index = search_index.SearchIndex()
+    index.add(project(1, title='Parking management system', abstract='A system for campus parking.', year=2021))
+    index.add(project(2, title='Library kiosk', abstract='Students reserve parking slots at the library.', major='BSCS'))
+    index.add(project(3, title='Grade monitoring', abstract='Monitors grades of students.', keywords='monitoring'))
+    index.add(project(4, title='Canteen ordering', abstract='An ordering system for the canteen.', year=2022))
+    return index
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert search_index.tokenize("The Monitoring of Systems") == ['monitor', 'system']
+    assert search_index.tokenize(None) == []
+
+
+def test_title_hits_rank_above_abstract_hits(index):
+    assert index.search("parking") == ([1, 2], 2)
+
+
+def test_rare_terms_outweigh_common_ones(index):
+    # "system" is in two projects, "canteen" only in one
+    ids, total = index.search("canteen system")
+    assert ids[0] == 4
+    assert total == 2
+
+
+def test_stemmed_query_matches(index):
+    assert index.search("monitored grade")[0] == [3]
+
+
+def test_filters(index):
+    assert index.search("parking", major='BSCS') == ([2], 1)
+    assert index.search("parking system", year_from=2022) == ([4, 2], 2)
+    assert index.search("parking system", year_to=2021) == ([1], 1)
+
+
+def test_paging_with_offset(index):
+    everything, total = index.search("parking system ordering", limit=10)
+    assert total == 3
+    assert index.search("parking system ordering", limit=2) == (everything[:2], 3)
+    assert index.search("parking system ordering", limit=2, offset=2) == (everything[2:], 3)
+
+
+def test_ties_go_to_newest_project():
+    index = search_index.SearchIndex()
+    index.add(project(5, title='Tutoring'))
+    index.add(project(9, title='Tutoring'))
+    assert index.search("tutoring")[0] == [9, 5]
+
+
+def test_edit_and_remove(index):
+    index.add(project(2, title='Library kiosk', abstract='Book reservations.'))
+    assert index.search("parking") == ([1], 1)
+    index.remove(1)
+    assert index.search("parking") == ([], 0)
+    assert index.search("") == ([], 0)
+    assert len(index) == 3
+
+
+def test_search_converts_string_filters(monkeypatch, index):
+    monkeypatch.setattr(search_index, 'get_index', lambda: index)
+    assert search_index.search("parking system", year_from='2022', year_to='x', results_per_page=1, page=2) == ([2], 2)
+
+
+def test_refreshed_index_serves_stale_index_while_rebuilding():
+    built = []
+    release = threading.Event()
+
+    def build():
+        if built:
+            release.wait(5)
+        built.append(len(built))
+        return [f"build {len(built)}"]
+
+    refreshed = RefreshedIndex(build, lambda: 0, name='test-index')
+    first = refreshed.get()
+    assert first == ["build 1"]
+
+    # Stale: the old index comes back at once and a rebuild starts in the background
+    time.sleep(0.01)
+    started = time.monotonic()
+    assert refreshed.get() is first
+    assert time.monotonic() - started < 0.5
+
+    # Updates made during the rebuild land in both indexes
+    refreshed.apply(lambda index: index.append("edit"))
+    release.set()
+    for _ in range(100):
+        if refreshed.peek() is not first:
+            break
+        time.sleep(0.01)
+    assert first == ["build 1", "edit"]
+    assert refreshed.peek() == ["build 2", "edit"]
+
+
+def test_refreshed_index_keeps_old_index_when_rebuild_fails():
+    calls = []
+
+    def build():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("database unavailable")
+        return ["build 1"]
+
+    refreshed = RefreshedIndex(build, lambda: 0, name='test-index')
+    first = refreshed.get()
+    time.sleep(0.01)
+    refreshed.get()
+    for _ in range(100):
+        if not refreshed._rebuilding:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 2
+    assert refreshed.get() is first
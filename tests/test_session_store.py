@@ -0,0 +1,119 @@
+# tests/test_session_store.py
+# Round trips through the SQLite session store, directly and through a Flask app.
+import hashlib
+import os
+import pickle
+import struct
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+
+from flask import Flask, session
+
+import session_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return session_store.SqliteSessionInterface(path=str(tmp_path / 'sessions.sqlite3'), ttl=60)
+
+
+@pytest.fixture
+def app(store):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = store
+
+    def login():
+        session['username'] = 'reader'
+        session['saved'] = [1, 2]
+        return "ok"
+
+    def whoami():
+        return session.get('username', 'anonymous')
+
+    def save(project_id):
+        session['saved'] = session['saved'] + [project_id]
+        return ",".join(str(saved) for saved in session['saved'])
+
+    def logout():
+        session.clear()
+        return "bye"
+
+    app.add_url_rule('/login', endpoint='login', view_func=login)
+    app.add_url_rule('/whoami', endpoint='whoami', view_func=whoami)
+    app.add_url_rule('/save/<int:project_id>', endpoint='save', view_func=save)
+    app.add_url_rule('/logout', endpoint='logout', view_func=logout)
+    return app
+
+
+def test_store_and_load(store):
+    expires_at = time.time() + 60
+    store.store('sid-1', {'username': 'reader', 'saved': [1, 2]}, 1, expires_at)
+    assert store.load('sid-1') == (1, expires_at, {'username': 'reader', 'saved': [1, 2]})
+
+
+def test_load_returns_copy_of_cached_data(store):
+    store.store('sid-1', {'saved': [1]}, 1, time.time() + 60)
+    store.load('sid-1')[2]['saved'].append(2)
+    assert store.load('sid-1')[2] == {'saved': [1]}
+
+
+def test_load_rereads_newer_version(store, tmp_path):
+    store.store('sid-1', {'n': 1}, 1, time.time() + 60)
+    store.load('sid-1')
+
+    # Another worker writes version 2 behind this process's LRU
+    other = session_store.SqliteSessionInterface(path=str(tmp_path / 'sessions.sqlite3'), ttl=60)
+    other.store('sid-1', {'n': 2}, 2, time.time() + 60)
+    assert store.load('sid-1')[:1] == (2,)
+    assert store.load('sid-1')[2] == {'n': 2}
+
+
+def test_expired_session_is_dropped(store):
+    store.store('sid-1', {'n': 1}, 1, time.time() - 1)
+    assert store.load('sid-1') is None
+    store.store('sid-2', {'n': 2}, 1, time.time() - 1)
+    assert store.sweep() == 1
+
+
+def test_session_round_trip_through_app(app):
+    client = app.test_client()
+    assert client.get('/whoami').data == b"anonymous"
+
+    client.get('/login')
+    assert client.get('/whoami').data == b"reader"
+    assert client.get('/save/3').data == b"1,2,3"
+    assert client.get('/save/4').data == b"1,2,3,4"
+
+    client.get('/logout')
+    assert client.get('/whoami').data == b"anonymous"
+
+
+def test_unchanged_session_is_not_rewritten(app, store):
+    client = app.test_client()
+    client.get('/login')
+    sid = client.get_cookie('session').value
+    version = store.load(sid)[0]
+
+    client.get('/whoami')
+    assert store.load(sid)[0] == version
+
+
+def test_sweeper_starts_on_first_request(app, store):
+    assert store._sweeper_pid is None
+    app.test_client().get('/whoami')
+    assert store._sweeper_pid == os.getpid()
+
+
+def test_legacy_session_is_imported(tmp_path):
+    legacy_dir = tmp_path / 'flask_session'
+    legacy_dir.mkdir()
+    path = legacy_dir / hashlib.md5(b"session:old-sid").hexdigest()
+    path.write_bytes(struct.pack('I', 0) + pickle.dumps({'username': 'reader'}))
+
+    store = session_store.SqliteSessionInterface(path=str(tmp_path / 'sessions.sqlite3'), ttl=60, legacy_dir=str(legacy_dir))
+    assert store.load('old-sid')[2] == {'username': 'reader'}
+    assert not path.exists()
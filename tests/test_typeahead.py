@@ -0,0 +1,73 @@
+# tests/test_typeahead.py
+# Prefix matching and ranking for /search suggestions in typeahead.py.
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+import typeahead
+
+PROJECTS = [
+    {'project_id': 1, 'Title': 'Inventory System for Café-Bakery', 'Keywords': 'inventory, pos', 'Authors': 'Juan Dela Cruz'},
+    {'project_id': 2, 'Title': 'Smart Inventory Tracker', 'Keywords': 'iot; rfid', 'Authors': 'Ana Reyes and Ben Santos'},
+    {'project_id': 3, 'Title': 'Payroll Portal', 'Keywords': 'inventory', 'Authors': 'Carla Inventado'},
+    {'project_id': 4, 'Title': 'Iot Attendance', 'Keywords': '', 'Authors': ''},
+]
+
+
+@pytest.fixture
+def index():
+    index = typeahead.PrefixIndex()
+    index.load(PROJECTS)
+    return index
+
+
+def ids(suggestions):
+    return [suggestion['project_id'] for suggestion in suggestions]
+
+
+def test_normalize():
+    assert typeahead.normalize("  Café-Inventory!! ") == "cafe inventory"
+    assert typeahead.normalize(None) == ""
+
+
+def test_title_prefix_ranks_first(index):
+    # 1 starts with "inventory"; 2 has it as a later title word; 3 only as a keyword or author
+    assert ids(index.suggest("invent")) == [1, 2, 3]
+
+
+def test_project_appears_once_at_its_best_tier(index):
+    suggestions = index.suggest("inventory")
+    assert ids(suggestions) == [1, 2, 3]
+    assert suggestions[0] == {'project_id': 1, 'Title': 'Inventory System for Café-Bakery'}
+
+
+def test_keywords_and_author_surnames(index):
+    assert ids(index.suggest("rfid")) == [2]
+    assert ids(index.suggest("dela cruz")) == [1]
+    assert ids(index.suggest("santos")) == [2]
+    assert ids(index.suggest("iot")) == [4, 2]
+
+
+def test_accents_and_punctuation_in_query(index):
+    assert ids(index.suggest("CAFE bak")) == [1]
+
+
+def test_limit_and_empty_queries(index):
+    assert ids(index.suggest("invent", limit=2)) == [1, 2]
+    assert index.suggest("") == []
+    assert index.suggest("   ") == []
+    assert index.suggest("invent", limit=0) == []
+    assert index.suggest("zzz") == []
+
+
+def test_add_and_remove_match_bulk_load(index):
+    incremental = typeahead.PrefixIndex()
+    for project in PROJECTS:
+        incremental.add(project)
+    assert incremental._entries == index._entries
+
+    index.add({'project_id': 2, 'Title': 'Smart Attendance', 'Keywords': '', 'Authors': ''})
+    assert ids(index.suggest("inventory")) == [1, 3]
+    index.remove(1)
+    assert ids(index.suggest("inventory")) == [3]
+    assert len(index) == 3
@@ -0,0 +1,164 @@
+import bisect
+import re
+import threading
+import unicodedata
+
+from config import Config
+from connect import database_connection
+from refreshed_index import RefreshedIndex
+
+# Hard cap on suggestions returned per keystroke
+MAX_SUGGESTIONS = 10
+
+# Most index entries examined for a single prefix
+MAX_SCAN = 512
+
+# Match tiers, best first. A query that starts the title outranks one that
+# starts a word inside it, which outranks keyword and author matches.
+TITLE_PREFIX, TITLE_WORD, KEYWORD, AUTHOR = range(4)
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+# Function to normalize text for prefix matching ("Café-Inventory" -> "cafe inventory")
+def normalize(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM_RE.sub(' ', text.lower()).strip()
+
+
+def _keys_for(project):
+    """Yield (key, tier) pairs under which a project can be found."""
+    title = normalize(project.get('Title'))
+    if title:
+        yield title, TITLE_PREFIX
+        words = title.split(' ')
+        for i in range(1, len(words)):
+            yield ' '.join(words[i:]), TITLE_WORD
+    for keyword in re.split(r"[,;]", project.get('Keywords') or ''):
+        keyword = normalize(keyword)
+        if keyword:
+            yield keyword, KEYWORD
+    for author in re.split(r"[,;]| and ", project.get('Authors') or ''):
+        author = normalize(author)
+        if author:
+            yield author, AUTHOR
+            # Let "dela cruz" find "juan dela cruz"
+            parts = author.split(' ')
+            for i in range(1, len(parts)):
+                yield ' '.join(parts[i:]), AUTHOR
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over normalized titles, keywords and authors.
+
+    Entries are (key, tier, project_id) tuples kept in sorted order, so
+    every key starting with a prefix is one contiguous slice found with
+    two binary searches.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._project_entries = {}  # project_id -> entries added for it
+        self._titles = {}  # project_id -> display title
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._titles)
+
+    def add(self, project):
+        project_id = int(project['project_id'])
+        entries = sorted({(key, tier, project_id) for key, tier in _keys_for(project)})
+        with self._lock:
+            self._remove(project_id)
+            for entry in entries:
+                bisect.insort(self._entries, entry)
+            self._project_entries[project_id] = entries
+            self._titles[project_id] = project.get('Title')
+
+    def load(self, projects):
+        """Bulk-load projects; much faster than add() one at a time."""
+        entries = []
+        project_entries = {}
+        titles = {}
+        for project in projects:
+            project_id = int(project['project_id'])
+            mine = sorted({(key, tier, project_id) for key, tier in _keys_for(project)})
+            entries.extend(mine)
+            project_entries[project_id] = mine
+            titles[project_id] = project.get('Title')
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._project_entries = project_entries
+            self._titles = titles
+
+    def remove(self, project_id):
+        with self._lock:
+            self._remove(int(project_id))
+
+    def _remove(self, project_id):
+        for entry in self._project_entries.pop(project_id, ()):
+            i = bisect.bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+        self._titles.pop(project_id, None)
+
+    def suggest(self, query, limit=MAX_SUGGESTIONS):
+        """Return up to `limit` suggestions as [{'project_id', 'Title'}], best match first."""
+        prefix = normalize(query)
+        limit = max(0, min(limit, MAX_SUGGESTIONS))
+        if not prefix or not limit:
+            return []
+
+        with self._lock:
+            start = bisect.bisect_left(self._entries, (prefix,))
+            end = bisect.bisect_left(self._entries, (prefix + '\x7f',), start)
+            # A one-letter prefix can match a huge slice; only look at the first MAX_SCAN
+            # entries and stop early once enough top-tier hits are found.
+            end = min(end, start + MAX_SCAN)
+            best = {}
+            top_tier_hits = 0
+            for key, tier, project_id in self._entries[start:end]:
+                if tier < best.get(project_id, AUTHOR + 1):
+                    if tier == TITLE_PREFIX:
+                        top_tier_hits += 1
+                    best[project_id] = tier
+                    if top_tier_hits >= limit:
+                        break
+            ranked = sorted(best.items(), key=lambda item: (item[1], self._titles.get(item[0]) or ''))[:limit]
+            return [{'project_id': project_id, 'Title': self._titles.get(project_id)} for project_id, _ in ranked]
+
+
+# Function to load titles, keywords and authors of every project into a fresh PrefixIndex
+def build_index():
+    index = PrefixIndex()
+    with database_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT project_id, Title, Authors, Keywords FROM project_details")
+        index.load(cursor)
+    return index
+
+
+_index = RefreshedIndex(build_index, lambda: Config.SEARCH_INDEX_REFRESH, name='typeahead')
+
+
+# Function to get the process-wide prefix index, rebuilt in the background every SEARCH_INDEX_REFRESH seconds
+def get_index():
+    return _index.get()
+
+
+# Function to add or refresh one project after it is saved or edited
+def index_project(project):
+    _index.apply(lambda index: index.add(project))
+
+
+# Function to drop a project after it is deleted
+def unindex_project(project_id):
+    _index.apply(lambda index: index.remove(project_id))
+
+
+# Function to get typeahead suggestions for the /search route
+def suggest(query, limit=MAX_SUGGESTIONS):
+    return get_index().suggest(query, limit)